@@ -12,15 +12,20 @@ import sys
 import json
 import math
 import numpy as np
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Tuple, Dict
 import copy
+import ctypes
 import io
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
 try:
     from openpyxl import Workbook, load_workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.drawing.image import Image as XLImage
     EXCEL_SUPPORT = True
 except ImportError:
@@ -33,6 +38,23 @@ try:
 except ImportError:
     PIL_SUPPORT = False
 
+# 更快的JSON导出（可选）
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
+# JIT加速支持（可选）
+try:
+    from numba import njit, prange
+    NUMBA_SUPPORT = True
+    # 编译结果缓存写在源码旁的 __pycache__；PyInstaller 打包后没有可写的源码目录，只在内存中编译
+    NUMBA_CACHE = not getattr(sys, "frozen", False)
+except ImportError:
+    NUMBA_SUPPORT = False
+    NUMBA_CACHE = False
+
 # PDF导出支持
 try:
     from reportlab.lib import colors
@@ -71,13 +93,16 @@ from PyQt6.QtWidgets import (
     QFileDialog, QMessageBox, QSplitter, QFrame, QSpinBox,
     QDoubleSpinBox, QStyle, QStyleFactory, QScrollArea,
     QDialog, QGridLayout, QFormLayout, QListWidget, QTabWidget,
-    QProgressDialog, QTextEdit, QSizePolicy
+    QProgressDialog, QTextEdit, QSizePolicy, QTableView, QButtonGroup
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont, QColor, QPalette, QIcon
+from PyQt6.QtCore import (
+    Qt, QTimer, QSize, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal
+)
+from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QPainter, QPixmap
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
+from OpenGL.error import GLError, NullFunctionError
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 
 
@@ -91,6 +116,12 @@ class PalletContent:
     rotated: bool = False  # 是否旋转
     quantity: int = 1  # 该货物的数量
     
+    def to_dict(self) -> dict:
+        """按字段导出为字典，见 Cargo.to_dict"""
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        d['cargo'] = self.cargo.to_dict()
+        return d
+    
     @property
     def actual_length(self) -> float:
         return self.cargo.width if self.rotated else self.cargo.length
@@ -125,8 +156,47 @@ class Cargo:
     
     def __post_init__(self):
         if not self.id:
-            import uuid
-            self.id = str(uuid.uuid4())[:8]
+            # 与 str(uuid4())[:8] 相同的前8位十六进制，不必先格式化整个带连字符的字符串
+            self.id = uuid.uuid4().hex[:8]
+        # 出图用的8位颜色，构造时算好（普通属性，不是 dataclass 字段，to_dict 导出时不包含）
+        # 依次为 原色 / 右侧面(较暗) / 前侧面(最暗)
+        r, g, b = self.color
+        self.color_u8 = (int(r * 255), int(g * 255), int(b * 255))
+        self.color_u8_80 = (int(r * 200), int(g * 200), int(b * 200))
+        self.color_u8_64 = (int(r * 160), int(g * 160), int(b * 160))
+        # 3D视图用的预缩放几何，按朝向缓存，见 gl_geometry
+        self._gl_geometry = {}
+    
+    def gl_geometry(self, rotated: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """按本货物尺寸缩放好的单位立方体面/棱顶点，各 (24,3) float32，GL坐标(长, 高, 宽)
+        同一SKU的所有件共用，绘制时只需加上位置；尺寸被修改后自动重算"""
+        key = (self.length, self.width, self.height)
+        cached = self._gl_geometry.get(rotated)
+        if cached is None or cached[0] != key:
+            l, w = (self.width, self.length) if rotated else (self.length, self.width)
+            size = np.array([l, self.height, w], dtype=np.float32)
+            cached = (key, _UNIT_CUBE_QUADS * size, _UNIT_CUBE_EDGES * size)
+            self._gl_geometry[rotated] = cached
+        return cached[1], cached[2]
+    
+    def unit_copy(self, unit_id: Optional[str] = None) -> 'Cargo':
+        """数量为1的浅拷贝，展开数量时使用；与 copy.copy 相同（共享出图颜色和3D几何缓存），
+        但直接复制实例字典，不经过 copy 模块的通用分派"""
+        unit = self.__class__.__new__(self.__class__)
+        unit.__dict__.update(self.__dict__)
+        unit.quantity = 1
+        if unit_id is not None:
+            unit.id = unit_id
+        return unit
+    
+    def to_dict(self) -> dict:
+        """按字段导出为可JSON序列化的字典
+        只包含 dataclass 字段（不含出图颜色、3D几何缓存等普通属性），不像 asdict 那样逐层深拷贝"""
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        d['color'] = list(self.color)
+        d['pallet_contents'] = [content.to_dict() for content in self.pallet_contents]
+        d['original_cargos'] = [cargo.to_dict() for cargo in self.original_cargos]
+        return d
     
     @property
     def volume(self) -> float:
@@ -211,6 +281,257 @@ class PlacedCargo:
     @property
     def center_z(self) -> float:
         return self.z + self.cargo.height / 2
+    
+    @staticmethod
+    def totals(placed_cargos: List['PlacedCargo']) -> Tuple[float, float]:
+        """一次遍历求 (总体积, 总重量)，按放置顺序累加，结果与分别 sum 相同"""
+        total_volume = 0
+        total_weight = 0
+        for placed in placed_cargos:
+            cargo = placed.cargo
+            total_volume += cargo.volume
+            total_weight += cargo.weight
+        return total_volume, total_weight
+
+
+@dataclass
+class PlacedCargoArrays:
+    """已放置货物的数组镜像（按列存储），供重心统计和3D视图批量读取"""
+    positions: np.ndarray  # (N, 3) x, y, z
+    sizes: np.ndarray      # (N, 3) 实际长、宽、高（已考虑旋转）
+    weights: np.ndarray    # (N,)
+    colors: np.ndarray     # (N, 3) RGB 0~1
+    
+    @classmethod
+    def from_placed(cls, placed_cargos: List[PlacedCargo]) -> 'PlacedCargoArrays':
+        n = len(placed_cargos)
+        data = np.array([(p.x, p.y, p.z, p.actual_length, p.actual_width, p.cargo.height, p.cargo.weight, *p.cargo.color)
+                         for p in placed_cargos], dtype=np.float64).reshape(n, 10)
+        return cls(data[:, 0:3], data[:, 3:6], data[:, 6], data[:, 7:10])
+    
+    def __len__(self) -> int:
+        return len(self.weights)
+    
+    @property
+    def centers(self) -> np.ndarray:
+        return self.positions + self.sizes / 2
+    
+    def center_of_gravity(self) -> Tuple[float, float, float]:
+        """按重量加权的重心位置，无货物或总重为0时返回原点"""
+        if len(self) == 0 or self.weights.sum() == 0:
+            return (0, 0, 0)
+        return tuple(np.average(self.centers, axis=0, weights=self.weights).tolist())
+
+
+def _ordered_row_sums(terms: np.ndarray, sign: int = 1) -> list:
+    """按列顺序逐项累加每行的非零项（sign=-1 时逐项相减）
+    结果与逐个已放置物品用 Python 累加完全一致（np.sum 的成对求和会改变舍入）"""
+    totals = [0] * len(terms)
+    rows, cols = np.nonzero(terms)
+    for row, value in zip(rows.tolist(), terms[rows, cols].tolist()):
+        totals[row] += sign * value
+    return totals
+
+
+def _box_collisions(b: np.ndarray, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                    length: float, width: float, height: float) -> np.ndarray:
+    """各候选位置 (K,) 放置 length×width×height 的货物时是否与包围盒 b (N,6) 中任一个重叠（各方向留 0.01 容差）"""
+    x, y, z = xs[:, None], ys[:, None], zs[:, None]
+    hit = ((x < b[:, 3] - 0.01) & (x + length > b[:, 0] + 0.01) &
+           (y < b[:, 4] - 0.01) & (y + width > b[:, 1] + 0.01) &
+           (z < b[:, 5] - 0.01) & (z + height > b[:, 2] + 0.01))
+    return hit.any(axis=1)
+
+
+def _box_overlaps(b, x, y, z, length, width, height):
+    """候选位置 (K,1) 与包围盒 b (N,6) 在 X/Y/Z 方向的重叠长度，各 (K,N)"""
+    overlap_x = np.maximum(0, np.minimum(x + length, b[:, 3]) - np.maximum(x, b[:, 0]))
+    overlap_y = np.maximum(0, np.minimum(y + width, b[:, 4]) - np.maximum(y, b[:, 1]))
+    overlap_z = np.maximum(0, np.minimum(z + height, b[:, 5]) - np.maximum(z, b[:, 2]))
+    return overlap_x, overlap_y, overlap_z
+
+
+def _box_support_areas(b: np.ndarray, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                       length: float, width: float) -> list:
+    """顶面与 z 齐平的包围盒对各候选底面 (x, y, length, width) 的支撑面积"""
+    x, y, z = xs[:, None], ys[:, None], zs[:, None]
+    overlap_x, overlap_y, _ = _box_overlaps(b, x, y, z, length, width, 0)
+    flush = np.abs(b[:, 5] - z) < 0.1
+    return _ordered_row_sums(np.where(flush, overlap_x * overlap_y, 0))
+
+
+def _box_contact_scores(b: np.ndarray, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                        length: float, width: float, height: float) -> list:
+    """各候选位置与包围盒的贴合得分（X/Y侧面贴合、底部支撑，越贴合越小）"""
+    x, y, z = xs[:, None], ys[:, None], zs[:, None]
+    overlap_x, overlap_y, overlap_z = _box_overlaps(b, x, y, z, length, width, height)
+    touch_x = (np.abs(x - b[:, 3]) < 0.1) | (np.abs(b[:, 0] - (x + length)) < 0.1)
+    touch_y = (np.abs(y - b[:, 4]) < 0.1) | (np.abs(b[:, 1] - (y + width)) < 0.1)
+    touch_z = np.abs(z - b[:, 5]) < 0.1
+    # (K, N, 3)：每个包围盒依次为 X、Y、Z 方向的贴合项
+    terms = np.stack([
+        np.where(touch_x, overlap_y * overlap_z * 0.01, 0),
+        np.where(touch_y, overlap_x * overlap_z * 0.01, 0),
+        np.where(touch_z, overlap_x * overlap_y * 0.02, 0),  # 底部支撑更重要
+    ], axis=2)
+    return _ordered_row_sums(terms.reshape(len(xs), 3 * len(b)), -1)
+
+
+def _mark_grid(axis_x: np.ndarray, axis_y: np.ndarray, x_lo: np.ndarray, x_hi: np.ndarray,
+               y_lo: np.ndarray, y_hi: np.ndarray) -> np.ndarray:
+    """网格 axis_x×axis_y（均为升序）中落在任一开区间矩形 (x_lo, x_hi)×(y_lo, y_hi) 内的点，(len(axis_x), len(axis_y))"""
+    x0, x1 = np.searchsorted(axis_x, x_lo, 'right'), np.searchsorted(axis_x, x_hi, 'left')
+    y0, y1 = np.searchsorted(axis_y, y_lo, 'right'), np.searchsorted(axis_y, y_hi, 'left')
+    keep = (x0 < x1) & (y0 < y1)
+    x0, x1, y0, y1 = x0[keep], x1[keep], y0[keep], y1[keep]
+    # 二维差分：矩形四角 +1/-1，两次前缀和后 >0 的格点即被覆盖
+    shape = (len(axis_x) + 1, len(axis_y) + 1)
+    corners = np.ravel_multi_index((np.concatenate([x0, x0, x1, x1]), np.concatenate([y0, y1, y0, y1])), shape)
+    signs = np.repeat([1, -1, -1, 1], len(x0))
+    diff = np.bincount(corners, signs, minlength=shape[0] * shape[1]).reshape(shape)
+    return diff.cumsum(axis=0).cumsum(axis=1)[:-1, :-1] > 0
+
+
+if NUMBA_SUPPORT:
+    # JIT版本：逐候选、逐包围盒标量计算，碰撞检测命中即停，不生成 (K,N) 中间数组；
+    # 不开 fastmath，求和按包围盒顺序逐项进行，结果与上面的 NumPy 版本逐位相同
+    @njit(cache=NUMBA_CACHE)
+    def _box_collisions_jit(b, xs, ys, zs, length, width, height):
+        hit = np.zeros(len(xs), dtype=np.bool_)
+        for k in range(len(xs)):
+            x, y, z = xs[k], ys[k], zs[k]
+            for j in range(b.shape[0]):
+                if (x < b[j, 3] - 0.01 and x + length > b[j, 0] + 0.01 and
+                        y < b[j, 4] - 0.01 and y + width > b[j, 1] + 0.01 and
+                        z < b[j, 5] - 0.01 and z + height > b[j, 2] + 0.01):
+                    hit[k] = True
+                    break
+        return hit
+    
+    @njit(cache=NUMBA_CACHE)
+    def _box_support_areas_jit(b, xs, ys, zs, length, width):
+        areas = np.zeros(len(xs))
+        for k in range(len(xs)):
+            x, y, z = xs[k], ys[k], zs[k]
+            total = 0.0
+            for j in range(b.shape[0]):
+                if abs(b[j, 5] - z) < 0.1:
+                    overlap_x = max(0.0, min(x + length, b[j, 3]) - max(x, b[j, 0]))
+                    overlap_y = max(0.0, min(y + width, b[j, 4]) - max(y, b[j, 1]))
+                    area = overlap_x * overlap_y
+                    if area != 0:
+                        total += area
+            areas[k] = total
+        return areas
+    
+    @njit(cache=NUMBA_CACHE)
+    def _box_contact_scores_jit(b, xs, ys, zs, length, width, height):
+        scores = np.zeros(len(xs))
+        for k in range(len(xs)):
+            x, y, z = xs[k], ys[k], zs[k]
+            total = 0.0
+            for j in range(b.shape[0]):
+                overlap_x = max(0.0, min(x + length, b[j, 3]) - max(x, b[j, 0]))
+                overlap_y = max(0.0, min(y + width, b[j, 4]) - max(y, b[j, 1]))
+                overlap_z = max(0.0, min(z + height, b[j, 5]) - max(z, b[j, 2]))
+                if abs(x - b[j, 3]) < 0.1 or abs(b[j, 0] - (x + length)) < 0.1:
+                    term = overlap_y * overlap_z * 0.01
+                    if term != 0:
+                        total -= term
+                if abs(y - b[j, 4]) < 0.1 or abs(b[j, 1] - (y + width)) < 0.1:
+                    term = overlap_x * overlap_z * 0.01
+                    if term != 0:
+                        total -= term
+                if abs(z - b[j, 5]) < 0.1:
+                    term = overlap_x * overlap_y * 0.02
+                    if term != 0:
+                        total -= term
+            scores[k] = total
+        return scores
+
+
+class PlacedBoxIndex:
+    """已放置货物包围盒的增量数组 (x0, y0, z0, x1, y1, z1)
+    装载算法的碰撞、支撑面积和贴合得分对所有已放置货物一次性向量化计算，不再逐个Python循环"""
+    
+    def __init__(self):
+        self._boxes = np.empty((64, 6), dtype=np.float64)
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes[:self._count]
+    
+    def add(self, placed: PlacedCargo):
+        """追加一个已放置货物，容量不足时翻倍"""
+        if self._count == len(self._boxes):
+            self._boxes = np.concatenate([self._boxes, np.empty_like(self._boxes)])
+        self._boxes[self._count] = (placed.x, placed.y, placed.z,
+                                    placed.x + placed.actual_length,
+                                    placed.y + placed.actual_width,
+                                    placed.z + placed.cargo.height)
+        self._count += 1
+    
+    def rebuild(self, placed_cargos: List[PlacedCargo]):
+        self._count = 0
+        for placed in placed_cargos:
+            self.add(placed)
+    
+    # 宽阶段分段：候选数×已放置数超过该值时，候选位置按 X 排序后每 _SLAB_SIZE 个一段，
+    # 每段只和 X 方向可能相交的已放置货物做精确计算（货物多时 K×N 的比较量按段缩小）
+    _SLAB_MIN_PAIRS = 1 << 16
+    _SLAB_SIZE = 128
+    
+    def _per_slab(self, xs: np.ndarray, length: float, margin: float, rows, out):
+        """按 X 分段调用 rows(段内候选下标, 可能相交的包围盒) 求各候选的结果，写入 out 并返回
+        每段取 X 区间与 [段内最小x - margin, 段内最大x + length + margin] 相交的货物（保持原顺序），只多不漏；
+        不相交的货物对结果没有贡献，所以与对全部货物计算的结果相同"""
+        b = self.boxes
+        if len(xs) * len(b) <= self._SLAB_MIN_PAIRS:
+            out[:] = rows(np.arange(len(xs)), b)
+            return out
+        order = np.argsort(xs, kind='stable')
+        for start in range(0, len(order), self._SLAB_SIZE):
+            cand = order[start:start + self._SLAB_SIZE]
+            lo, hi = xs[cand[0]], xs[cand[-1]]
+            near = b[(b[:, 3] > lo - margin) & (b[:, 0] < hi + length + margin)]
+            for k, value in zip(cand.tolist(), rows(cand, near)):
+                out[k] = value
+        return out
+    
+    def collides(self, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                 length: float, width: float, height: float) -> np.ndarray:
+        """各候选位置 (K,) 放置 length×width×height 的货物时是否与任一已放置货物重叠（各方向留 0.01 容差）"""
+        if NUMBA_SUPPORT:
+            return _box_collisions_jit(self.boxes, xs, ys, zs, float(length), float(width), float(height))
+        return self._per_slab(
+            xs, length, 0.01,
+            lambda cand, b: _box_collisions(b, xs[cand], ys[cand], zs[cand], length, width, height),
+            np.zeros(len(xs), dtype=bool))
+    
+    def support_areas(self, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, length: float, width: float) -> list:
+        """顶面与 z 齐平的货物对各候选底面 (x, y, length, width) 的支撑面积"""
+        if NUMBA_SUPPORT:
+            return _box_support_areas_jit(self.boxes, xs, ys, zs, float(length), float(width)).tolist()
+        return self._per_slab(
+            xs, length, 0,
+            lambda cand, b: _box_support_areas(b, xs[cand], ys[cand], zs[cand], length, width),
+            [0] * len(xs))
+    
+    def contact_scores(self, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                       length: float, width: float, height: float) -> list:
+        """各候选位置与已放置货物的贴合得分（X/Y侧面贴合、底部支撑，越贴合越小）"""
+        if NUMBA_SUPPORT:
+            return _box_contact_scores_jit(self.boxes, xs, ys, zs,
+                                           float(length), float(width), float(height)).tolist()
+        # X 方向贴合的货物可能与候选只在 X 上相接（重叠为0），区间两端各放宽 0.1
+        return self._per_slab(
+            xs, length, 0.1,
+            lambda cand, b: _box_contact_scores(b, xs[cand], ys[cand], zs[cand], length, width, height),
+            [0] * len(xs))
 
 
 @dataclass
@@ -239,6 +560,13 @@ class ContainerLoadingResult:
         if self.container.max_weight == 0:
             return 0
         return (self.total_weight / self.container.max_weight) * 100
+    
+    def summary(self) -> Tuple[float, float, float, float]:
+        """一次遍历求 (总体积, 总重量, 体积利用率, 载重利用率)，与分别读取上面四个属性的结果相同"""
+        total_volume, total_weight = PlacedCargo.totals(self.placed_cargos)
+        volume_util = 0 if self.container.volume == 0 else (total_volume / self.container.volume) * 100
+        weight_util = 0 if self.container.max_weight == 0 else (total_weight / self.container.max_weight) * 100
+        return total_volume, total_weight, volume_util, weight_util
 
 
 # ==================== 容器预设 ====================
@@ -391,6 +719,20 @@ DEFAULT_RULES = [
     RuleVolumeFirst(),
 ]
 
+# 规则名称 -> 规则类，配载时按规则表中的名称查表构造
+RULE_REGISTRY: Dict[str, type] = {
+    "相同尺寸优先": RuleSameSizeFirst,
+    "重物下沉": RuleHeavyBottom,
+    "相近尺寸堆叠": RuleSimilarSizeStack,
+    "体积优先": RuleVolumeFirst,
+    "按优先级": RulePriorityFirst,
+    # 旧版本使用的名称
+    "重货在下": RuleHeavyBottom,
+    "相似尺寸堆叠": RuleSimilarSizeStack,
+    "体积大优先": RuleVolumeFirst,
+    "优先级排序": RulePriorityFirst,
+}
+
 
 class LoadingAlgorithm:
     """装载算法类 - 优化版，目标是最高装载率"""
@@ -405,60 +747,81 @@ class LoadingAlgorithm:
         self.similar_size_tolerance = 50  # mm，相近尺寸容差
         # 空间网格步长，用于更精细的位置搜索
         self.grid_step = 10  # cm
+        # placed_cargos 的包围盒数组，放置时增量追加
+        self.box_index = PlacedBoxIndex()
+        # 每件已放置货物贡献的候选坐标，按放置顺序增量追加，见 get_candidate_positions：
+        # 贴靠坐标按 (长, 宽, 是否只能放底层) 分别缓存，沿容器边缘的坐标与待放货物无关
+        self._adjacent_positions: Dict[tuple, Tuple[int, list]] = {}
+        self._edge_positions: Tuple[int, list] = (0, [])
+        # (已放置件数, 该状态下放不下的货物尺寸)：同尺寸的后续单件直接判定放不下，放入新货物后作废
+        self._no_fit: Tuple[int, set] = (0, set())
+    
+    def _boxes(self) -> PlacedBoxIndex:
+        """返回与 placed_cargos 同步的包围盒索引（外部替换/删减了 placed_cargos 时重建）"""
+        if len(self.box_index) != len(self.placed_cargos):
+            self.box_index.rebuild(self.placed_cargos)
+        return self.box_index
     
     def can_place(self, cargo: Cargo, x: float, y: float, z: float, rotated: bool) -> bool:
+        return self.score_positions(cargo, [(x, y, z)], rotated, score=False)[0] is not None
+    
+    def score_positions(self, cargo: Cargo, positions: List[Tuple[float, float, float]], rotated: bool,
+                        score: bool = True) -> List[Optional[float]]:
+        """批量判断候选位置能否放置并计算得分（分数越低越好），不能放置的位置为 None
+        边界、碰撞、支撑对所有候选位置和已放置货物一次性计算；score=False 时能放置的位置返回 0"""
+        n = len(positions)
+        results: List[Optional[float]] = [None] * n
+        if n == 0:
+            return results
+        xs, ys, zs = np.array(positions, dtype=np.float64).reshape(n, 3).T
+        for k, value in zip(*self._feasible_scores(cargo, positions, xs, ys, zs, rotated, score)):
+            results[k] = value
+        return results
+    
+    def _feasible_scores(self, cargo: Cargo, positions: list, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                         rotated: bool, score: bool = True) -> Tuple[List[int], List[float]]:
+        """score_positions 的稀疏形式：返回 (能放置的候选下标（升序）, 对应得分)
+        xs/ys/zs 为 positions 的坐标数组；得分用 positions 中的原始坐标计算"""
         # 检查是否允许旋转
         if rotated and not cargo.allow_rotate:
-            return False
+            return [], []
         
         length = cargo.width if rotated else cargo.length
         width = cargo.length if rotated else cargo.width
         height = cargo.height
         
-        # 检查是否只能放底层
-        if cargo.bottom_only and z > 0.01:
-            return False
-        
         # 严格的边界检查 - 不允许任何超出
-        if x < -0.01 or y < -0.01 or z < -0.01:
-            return False
-        if x + length > self.container.length + 0.01:
-            return False
-        if y + width > self.container.width + 0.01:
-            return False
-        if z + height > self.container.height + 0.01:
-            return False
+        ok = ((xs >= -0.01) & (ys >= -0.01) & (zs >= -0.01) &
+              (xs + length <= self.container.length + 0.01) &
+              (ys + width <= self.container.width + 0.01) &
+              (zs + height <= self.container.height + 0.01))
+        # 检查是否只能放底层
+        if cargo.bottom_only:
+            ok &= zs <= 0.01
         
-        # 碰撞检测
-        for placed in self.placed_cargos:
-            pl = placed.actual_length
-            pw = placed.actual_width
-            ph = placed.cargo.height
-            
-            # 使用严格的碰撞检测
-            if (x < placed.x + pl - 0.01 and x + length > placed.x + 0.01 and
-                y < placed.y + pw - 0.01 and y + width > placed.y + 0.01 and
-                z < placed.z + ph - 0.01 and z + height > placed.z + 0.01):
-                return False
+        boxes = self._boxes()
+        # 碰撞检测（严格）
+        idx = np.flatnonzero(ok)
+        ok[idx] = ~boxes.collides(xs[idx], ys[idx], zs[idx], length, width, height)
         
-        # 堆叠支撑检查
-        if z > 0.01:
-            support_area = 0
+        # 堆叠支撑检查：支撑面积至少为底面的70%
+        idx = np.flatnonzero(ok & (zs > 0.01))
+        if len(idx):
             required_support = length * width * 0.7
-            
-            for placed in self.placed_cargos:
-                if abs(placed.z + placed.cargo.height - z) < 0.1:
-                    pl = placed.actual_length
-                    pw = placed.actual_width
-                    
-                    overlap_x = max(0, min(x + length, placed.x + pl) - max(x, placed.x))
-                    overlap_y = max(0, min(y + width, placed.y + pw) - max(y, placed.y))
-                    support_area += overlap_x * overlap_y
-            
-            if support_area < required_support:
-                return False
+            areas = boxes.support_areas(xs[idx], ys[idx], zs[idx], length, width)
+            ok[idx] = [area >= required_support for area in areas]
         
-        return True
+        idx = np.flatnonzero(ok)
+        feasible = idx.tolist()
+        if not score:
+            return feasible, [0] * len(feasible)
+        
+        contacts = boxes.contact_scores(xs[idx], ys[idx], zs[idx], length, width, height)
+        scores = []
+        for k, contact_score in zip(feasible, contacts):
+            x, y, z = positions[k]
+            scores.append(self._placement_score(x, y, z, length, width, height, contact_score))
+        return feasible, scores
     
     def calculate_best_rotation_for_layer(self, cargo: Cargo) -> bool:
         """计算在当前层最优的旋转方向，目标是最大化可放置数量"""
@@ -479,50 +842,61 @@ class LoadingAlgorithm:
         return count_rotated > count_no_rotate
     
     def get_candidate_positions(self, cargo: Cargo, rotated: bool) -> List[Tuple[float, float, float]]:
-        """获取所有候选放置位置 - 优化版"""
-        positions = set()
-        
+        """获取所有候选放置位置 - 优化版
+        每件已放置货物贡献的坐标只在它放置后第一次被用到时计算一次；
+        集合按与逐个 add 完全相同的顺序插入，候选位置及其顺序与每次全量生成时一致"""
         length = cargo.width if rotated else cargo.length
         width = cargo.length if rotated else cargo.width
-        
-        # 基础位置：原点
-        positions.add((0, 0, 0))
-        
-        # 基于已放置货物生成候选位置
-        for placed in self.placed_cargos:
+        placed_cargos = self.placed_cargos
+        count = len(placed_cargos)
+        
+        key = (length, width, cargo.bottom_only)
+        done, adjacent = self._adjacent_positions.get(key, (0, []))
+        if done > count:  # placed_cargos 被外部替换/删减，重新生成
+            done, adjacent = 0, []
+        for placed in placed_cargos[done:]:
             pl = placed.actual_length
             pw = placed.actual_width
             ph = placed.cargo.height
             
             # 货物右侧
-            positions.add((placed.x + pl, placed.y, placed.z))
+            adjacent.append((placed.x + pl, placed.y, placed.z))
             # 货物后方
-            positions.add((placed.x, placed.y + pw, placed.z))
+            adjacent.append((placed.x, placed.y + pw, placed.z))
             # 货物顶部（如果可堆叠）
             if placed.cargo.stackable and not cargo.bottom_only:
-                positions.add((placed.x, placed.y, placed.z + ph))
+                adjacent.append((placed.x, placed.y, placed.z + ph))
             
             # 额外的紧凑位置 - 靠近已放置货物的边缘
             # 右侧对齐
             if placed.x + pl + length <= self.container.length:
-                positions.add((placed.x + pl, 0, placed.z))
-                positions.add((placed.x + pl, 0, 0))
+                adjacent.append((placed.x + pl, 0, placed.z))
+                adjacent.append((placed.x + pl, 0, 0))
             # 后方对齐
             if placed.y + pw + width <= self.container.width:
-                positions.add((0, placed.y + pw, placed.z))
-                positions.add((0, placed.y + pw, 0))
+                adjacent.append((0, placed.y + pw, placed.z))
+                adjacent.append((0, placed.y + pw, 0))
+        self._adjacent_positions[key] = (count, adjacent)
         
         # 沿着容器边缘的位置
-        for placed in self.placed_cargos:
+        done, edges = self._edge_positions
+        if done > count:
+            done, edges = 0, []
+        for placed in placed_cargos[done:]:
             pl = placed.actual_length
             pw = placed.actual_width
             # 尝试贴着左边界
-            positions.add((0, placed.y, placed.z))
-            positions.add((0, placed.y + pw, placed.z))
+            edges.append((0, placed.y, placed.z))
+            edges.append((0, placed.y + pw, placed.z))
             # 尝试贴着前边界
-            positions.add((placed.x, 0, placed.z))
-            positions.add((placed.x + pl, 0, placed.z))
+            edges.append((placed.x, 0, placed.z))
+            edges.append((placed.x + pl, 0, placed.z))
+        self._edge_positions = (count, edges)
         
+        # 基础位置：原点
+        positions = {(0, 0, 0)}
+        positions.update(adjacent)
+        positions.update(edges)
         return list(positions)
     
     def calculate_placement_score(self, cargo: Cargo, x: float, y: float, z: float, rotated: bool) -> float:
@@ -530,41 +904,24 @@ class LoadingAlgorithm:
         length = cargo.width if rotated else cargo.length
         width = cargo.length if rotated else cargo.width
         
+        # 紧凑性得分：与已有货物的贴合度（在X、Y或Z方向上紧贴）
+        contact_score = self._boxes().contact_scores(
+            np.array([x], dtype=np.float64), np.array([y], dtype=np.float64), np.array([z], dtype=np.float64),
+            length, width, cargo.height)[0]
+        return self._placement_score(x, y, z, length, width, cargo.height, contact_score)
+    
+    def _placement_score(self, x: float, y: float, z: float, length: float, width: float, height: float,
+                         contact_score: float) -> float:
+        """在贴合得分基础上加上位置、边界贴合和空间浪费得分"""
         # 基础得分：优先填充角落和边缘
         # 越靠近原点越好
         distance_score = x * 1.0 + y * 1.5 + z * 2.0
         
-        # 紧凑性得分：与已有货物的贴合度
-        contact_score = 0
-        for placed in self.placed_cargos:
-            pl = placed.actual_length
-            pw = placed.actual_width
-            ph = placed.cargo.height
-            
-            # 检查是否紧贴（在X、Y或Z方向上相邻）
-            # X方向贴合
-            if abs(x - (placed.x + pl)) < 0.1 or abs(placed.x - (x + length)) < 0.1:
-                overlap_y = max(0, min(y + width, placed.y + pw) - max(y, placed.y))
-                overlap_z = max(0, min(z + cargo.height, placed.z + ph) - max(z, placed.z))
-                contact_score -= overlap_y * overlap_z * 0.01
-            
-            # Y方向贴合
-            if abs(y - (placed.y + pw)) < 0.1 or abs(placed.y - (y + width)) < 0.1:
-                overlap_x = max(0, min(x + length, placed.x + pl) - max(x, placed.x))
-                overlap_z = max(0, min(z + cargo.height, placed.z + ph) - max(z, placed.z))
-                contact_score -= overlap_x * overlap_z * 0.01
-            
-            # Z方向贴合（底部支撑）
-            if abs(z - (placed.z + ph)) < 0.1:
-                overlap_x = max(0, min(x + length, placed.x + pl) - max(x, placed.x))
-                overlap_y = max(0, min(y + width, placed.y + pw) - max(y, placed.y))
-                contact_score -= overlap_x * overlap_y * 0.02  # 底部支撑更重要
-        
         # 边界贴合加分
         if x < 0.1:  # 贴左边界
-            contact_score -= width * cargo.height * 0.005
+            contact_score -= width * height * 0.005
         if y < 0.1:  # 贴前边界
-            contact_score -= length * cargo.height * 0.005
+            contact_score -= length * height * 0.005
         if z < 0.1:  # 贴底部
             contact_score -= length * width * 0.01
         
@@ -601,6 +958,12 @@ class LoadingAlgorithm:
 
     def find_position(self, cargo: Cargo) -> Optional[Tuple[float, float, float, bool]]:
         """寻找最佳放置位置 - 优化版，优先考虑最大化装载率的旋转方向"""
+        # 搜索结果只取决于这几项和已放置货物；同一装载状态下已确认放不下的尺寸不再重复搜索
+        fit_key = (cargo.length, cargo.width, cargo.height, cargo.allow_rotate, cargo.bottom_only)
+        count, no_fit = self._no_fit
+        if count == len(self.placed_cargos) and fit_key in no_fit:
+            return None
+        
         best_position = None
         best_score = float('inf')
         
@@ -617,9 +980,8 @@ class LoadingAlgorithm:
             # 获取候选位置
             positions = self.get_candidate_positions(cargo, rotated)
             
-            for x, y, z in positions:
-                if self.can_place(cargo, x, y, z, rotated):
-                    score = self.calculate_placement_score(cargo, x, y, z, rotated)
+            for (x, y, z), score in zip(positions, self.score_positions(cargo, positions, rotated)):
+                if score is not None:
                     # 如果使用最优旋转方向，给予额外优势
                     if rotated == optimal_rotation:
                         score -= 100  # 奖励最优旋转
@@ -635,19 +997,54 @@ class LoadingAlgorithm:
                 z_levels.append(placed.z + placed.cargo.height)
             z_levels = sorted(set(z_levels))
             
+            grid = [(x, y) for x in range(0, int(self.container.length), self.grid_step)
+                    for y in range(0, int(self.container.width), self.grid_step)]
+            grid_x, grid_y = np.array(grid, dtype=np.float64).reshape(len(grid), 2).T
+            axis_x = np.arange(0, int(self.container.length), self.grid_step, dtype=np.float64)
+            axis_y = np.arange(0, int(self.container.width), self.grid_step, dtype=np.float64)
+            boxes = self._boxes().boxes
             for z in z_levels:
-                for x in range(0, int(self.container.length), self.grid_step):
-                    for y in range(0, int(self.container.width), self.grid_step):
-                        for rotated in rotations:
-                            if self.can_place(cargo, x, y, z, rotated):
-                                score = self.calculate_placement_score(cargo, x, y, z, rotated)
-                                if rotated == optimal_rotation:
-                                    score -= 100
-                                if score < best_score:
-                                    best_score = score
-                                    best_position = (x, y, z, rotated)
-        
-        return best_position
+                # 整层超高或只能放底层时，该层所有网格点都放不下
+                if z + cargo.height > self.container.height + 0.01 or (cargo.bottom_only and z > 0.01):
+                    continue
+                flush = boxes[np.abs(boxes[:, 5] - z) < 0.1] if z > 0.01 else None
+                solid = boxes[(z < boxes[:, 5] - 0.01) & (z + cargo.height > boxes[:, 2] + 0.01)]
+                # 每层每个旋转方向的网格点一次性评估，绝大多数点在这里就被排除；
+                # 只对能放置的点按 x→y→旋转 的原顺序比较
+                feasible = []
+                for order, rotated in enumerate(rotations):
+                    length = cargo.width if rotated else cargo.length
+                    width = cargo.length if rotated else cargo.width
+                    # 先在网格上按区间预筛（边界各留 1e-6 余量，只排除一定不能放的点），剩余点再精确检查：
+                    # 悬空位置须压在顶面与 z 齐平的货物上（支撑面积>0），且不能落在与本层等高的货物里
+                    mask = np.ones((len(axis_x), len(axis_y)), dtype=bool)
+                    if flush is not None and length * width > 0:
+                        mask = _mark_grid(axis_x, axis_y, flush[:, 0] - length - 1e-6, flush[:, 3] + 1e-6,
+                                          flush[:, 1] - width - 1e-6, flush[:, 4] + 1e-6)
+                    if len(solid):
+                        mask &= ~_mark_grid(axis_x, axis_y,
+                                            solid[:, 0] + 0.01 - length + 1e-6, solid[:, 3] - 0.01 - 1e-6,
+                                            solid[:, 1] + 0.01 - width + 1e-6, solid[:, 4] - 0.01 - 1e-6)
+                    sub = np.flatnonzero(mask)
+                    if not len(sub):
+                        continue
+                    positions = [grid[i] + (z,) for i in sub.tolist()]
+                    indices, scores = self._feasible_scores(cargo, positions, grid_x[sub], grid_y[sub],
+                                                            np.full(len(sub), z, dtype=np.float64), rotated)
+                    feasible.extend(zip(sub[indices].tolist(), [order] * len(indices), scores))
+                feasible.sort(key=lambda item: (item[0], item[1]))
+                for i, order, score in feasible:
+                    rotated = rotations[order]
+                    if rotated == optimal_rotation:
+                        score -= 100
+                    if score < best_score:
+                        best_score = score
+                        best_position = grid[i] + (z, rotated)
+            
+            if best_position is None:
+                if count != len(self.placed_cargos):
+                    self._no_fit = (len(self.placed_cargos), set())
+                self._no_fit[1].add(fit_key)
         
         return best_position
     
@@ -657,10 +1054,22 @@ class LoadingAlgorithm:
             x, y, z, rotated = position
             self.step_counter += 1
             placed = PlacedCargo(cargo, x, y, z, rotated, self.step_counter)
+            self._boxes().add(placed)
             self.placed_cargos.append(placed)
             return True
         return False
     
+    def place_cargo_batch(self, cargos: List[Cargo]) -> Tuple[List[PlacedCargo], List[Cargo]]:
+        """按顺序逐个放置，返回 (本次放置的货物, 放不下的货物)"""
+        loaded = []
+        not_loaded = []
+        for cargo in cargos:
+            if self.place_cargo(cargo):
+                loaded.append(self.placed_cargos[-1])
+            else:
+                not_loaded.append(cargo)
+        return loaded, not_loaded
+    
     def apply_rules(self, cargos: List[Cargo]) -> List[Cargo]:
         """应用所有启用的规则 - 使用复合排序实现多规则联合作用"""
         # 获取启用的规则，按优先级降序
@@ -670,36 +1079,35 @@ class LoadingAlgorithm:
         if not enabled_rules:
             return cargos
         
-        # 使用复合排序键：每个规则产生一个排序分数
-        def composite_key(cargo):
-            scores = []
-            for rule in enabled_rules:
-                if rule.id == "priority_first":
-                    # 优先级规则：优先级越高分数越高
-                    scores.append(-cargo.priority)  # 负号使高优先级排前面
-                elif rule.id == "heavy_bottom":
-                    # 重物下沉：重货优先
-                    threshold = getattr(rule, 'weight_threshold', 100)
-                    if cargo.weight >= threshold:
-                        scores.append(0)  # 重货排前
-                    else:
-                        scores.append(1)  # 轻货排后
-                    scores.append(-cargo.weight)  # 同类按重量降序
-                elif rule.id == "volume_first":
-                    # 体积优先：体积越大排越前
-                    scores.append(-cargo.volume)
-                elif rule.id == "similar_stack":
-                    # 相近尺寸：按长度分组
-                    scores.append(-cargo.length)
-                elif rule.id == "same_size":
-                    # 相同尺寸优先：按尺寸分组
-                    size_group = (round(cargo.length / 10) * 10, 
-                                 round(cargo.width / 10) * 10, 
-                                 round(cargo.height / 10) * 10)
-                    scores.append((-size_group[0], -size_group[1], -size_group[2]))
-            return tuple(scores)
-        
-        return sorted(cargos, key=composite_key)
+        # 复合排序键：每个规则产生一列排序分数，所有货物的分数一次性按列算好后用 np.lexsort 稳定排序
+        # （与逐件构造键元组再 sorted 的顺序完全相同）
+        attrs = np.array([(c.priority, c.weight, c.length, c.width, c.height) for c in cargos],
+                         dtype=np.float64).reshape(len(cargos), 5)
+        priority, weight, length, width, height = attrs.T
+        columns = []
+        for rule in enabled_rules:
+            if rule.id == "priority_first":
+                # 优先级规则：优先级越高分数越高
+                columns.append(-priority)  # 负号使高优先级排前面
+            elif rule.id == "heavy_bottom":
+                # 重物下沉：重货优先（重货0排前，轻货1排后），同类按重量降序
+                threshold = getattr(rule, 'weight_threshold', 100)
+                columns.append((weight < threshold).astype(np.float64))
+                columns.append(-weight)
+            elif rule.id == "volume_first":
+                # 体积优先：体积越大排越前
+                columns.append(-(length * width * height))
+            elif rule.id == "similar_stack":
+                # 相近尺寸：按长度分组
+                columns.append(-length)
+            elif rule.id == "same_size":
+                # 相同尺寸优先：按尺寸分组（np.round 与 round 一样四舍六入五成双）
+                columns.extend(-(np.round(size / 10) * 10) for size in (length, width, height))
+        if not columns:
+            return list(cargos)
+        # lexsort 以最后一列为主键
+        order = np.lexsort(columns[::-1])
+        return [cargos[i] for i in order.tolist()]
     
     def expand_groups(self, cargos: List[Cargo]) -> List[Cargo]:
         """处理货物组，将组合货物合并为单个虚拟货物"""
@@ -757,43 +1165,20 @@ class LoadingAlgorithm:
         sorted_cargos = []
         for cargo in processed_cargos:
             for i in range(cargo.quantity):
-                single_cargo = copy.copy(cargo)
-                single_cargo.quantity = 1
-                single_cargo.id = f"{cargo.id}_{i}"
-                sorted_cargos.append(single_cargo)
+                sorted_cargos.append(cargo.unit_copy(f"{cargo.id}_{i}"))
         
         # 应用配载规则
         sorted_cargos = self.apply_rules(sorted_cargos)
         
-        loaded = []
-        not_loaded = []
-        
-        for cargo in sorted_cargos:
-            if self.place_cargo(cargo):
-                loaded.append(self.placed_cargos[-1])
-            else:
-                not_loaded.append(cargo)
-        
-        return loaded, not_loaded
+        return self.place_cargo_batch(sorted_cargos)
     
     def calculate_center_of_gravity(self) -> Tuple[float, float, float]:
         """计算重心位置"""
-        if not self.placed_cargos:
-            return (0, 0, 0)
-        
-        total_weight = sum(p.cargo.weight for p in self.placed_cargos)
-        if total_weight == 0:
-            return (0, 0, 0)
-        
-        cx = sum(p.center_x * p.cargo.weight for p in self.placed_cargos) / total_weight
-        cy = sum(p.center_y * p.cargo.weight for p in self.placed_cargos) / total_weight
-        cz = sum(p.center_z * p.cargo.weight for p in self.placed_cargos) / total_weight
-        
-        return (cx, cy, cz)
+        return PlacedCargoArrays.from_placed(self.placed_cargos).center_of_gravity()
     
-    def calculate_center_offset(self) -> Tuple[float, float, float]:
-        """计算重心偏移量（相对于容器中心）"""
-        cx, cy, cz = self.calculate_center_of_gravity()
+    def calculate_center_offset(self, center_of_gravity: Optional[Tuple[float, float, float]] = None) -> Tuple[float, float, float]:
+        """计算重心偏移量（相对于容器中心），已算好的重心可直接传入"""
+        cx, cy, cz = center_of_gravity or self.calculate_center_of_gravity()
         container_cx = self.container.length / 2
         container_cy = self.container.width / 2
         container_cz = self.container.height / 2
@@ -840,11 +1225,14 @@ class LoadingAlgorithm:
         return steps
     
     def get_statistics(self) -> dict:
-        total_cargo_volume = sum(p.cargo.volume for p in self.placed_cargos)
-        total_cargo_weight = sum(p.cargo.weight for p in self.placed_cargos)
+        # 一次构建数组镜像，体积、重量和重心都在 numpy 中汇总
+        arrays = PlacedCargoArrays.from_placed(self.placed_cargos)
+        total_cargo_volume = float(arrays.sizes.prod(axis=1).sum())
+        total_cargo_weight = float(arrays.weights.sum())
+        center_of_gravity = arrays.center_of_gravity()
         
         # 计算重心偏移
-        offset_x, offset_y, offset_z = self.calculate_center_offset()
+        offset_x, offset_y, offset_z = self.calculate_center_offset(center_of_gravity)
         
         # 计算偏移百分比
         offset_x_pct = (offset_x / (self.container.length / 2)) * 100 if self.container.length > 0 else 0
@@ -856,12 +1244,35 @@ class LoadingAlgorithm:
             "volume_utilization": (total_cargo_volume / self.container.volume) * 100 if self.container.volume > 0 else 0,
             "total_weight": total_cargo_weight,
             "weight_utilization": (total_cargo_weight / self.container.max_weight) * 100 if self.container.max_weight > 0 else 0,
-            "center_of_gravity": self.calculate_center_of_gravity(),
+            "center_of_gravity": center_of_gravity,
             "center_offset": (offset_x, offset_y, offset_z),
             "center_offset_pct": (offset_x_pct, offset_y_pct),
         }
 
 
+# 单位立方体六个面的四边形顶点 (OpenGL坐标: x=长度, y=高度, z=宽度)
+_UNIT_CUBE_QUADS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1),  # 底面
+    (0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0),  # 顶面
+    (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0),  # 前面
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),  # 后面
+    (0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0),  # 左面
+    (1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1),  # 右面
+], dtype=np.float32)
+
+# 与 _UNIT_CUBE_QUADS 逐顶点对应的面法线
+_UNIT_CUBE_NORMALS = np.repeat(np.array([
+    (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1), (-1, 0, 0), (1, 0, 0),
+], dtype=np.float32), 4, axis=0)
+
+# 单位立方体的12条棱，GL_LINES 顶点对
+_UNIT_CUBE_EDGES = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 0, 0), (1, 0, 1), (1, 0, 1), (0, 0, 1), (0, 0, 1), (0, 0, 0),
+    (0, 1, 0), (1, 1, 0), (1, 1, 0), (1, 1, 1), (1, 1, 1), (0, 1, 1), (0, 1, 1), (0, 1, 0),
+    (0, 0, 0), (0, 1, 0), (1, 0, 0), (1, 1, 0), (1, 0, 1), (1, 1, 1), (0, 0, 1), (0, 1, 1),
+], dtype=np.float32)
+
+
 class Container3DView(QOpenGLWidget):
     """OpenGL 3D视图组件 - 支持拖拽选择和多集装箱"""
     
@@ -899,6 +1310,24 @@ class Container3DView(QOpenGLWidget):
         self.on_cargo_moved = None  # 移动货物后的回调
         self.on_cargo_rotated = None  # 旋转货物后的回调
         
+        # 颜色拾取用的索引编码颜色 (N,3) uint8，按需扩容
+        self._pick_colors: Optional[np.ndarray] = None
+        
+        # 场景帧缓存：场景未变化时 paintGL 直接从缓存FBO复制上一帧
+        self._scene_dirty = True
+        self._scene_fbo = None  # (fbo, renderbuffer)；None 为尚未创建，False 为驱动不支持、已关闭
+        self._scene_fbo_size = (0, 0)
+        
+        # 货物网格VBO：所有货物的面/边框合并为两个顶点缓冲，货物变化时才重建
+        self._cargo_vbo = None  # (面vbo, 边框vbo)，False 表示驱动不支持
+        self._cargo_vbo_dirty = True
+        self._cargo_vbo_patches = set()  # 只需局部更新的货物索引（拖拽/微调/旋转单个货物）
+        self._cargo_vertex_count = 0
+        self._cargo_bounds = np.zeros((0, 2, 3), dtype=np.float32)  # 网格中每个货物的GL坐标包围盒 (min, max)
+        
+        self.overview_spacing = 200  # 概览模式下集装箱之间的间隙 (cm)
+        self.overview_tiled = True  # 多个集装箱时概览按网格分块显示，False 为沿长度方向并排
+        
         self.setMinimumSize(600, 400)
     
     def set_drag_mode(self, enabled: bool):
@@ -907,7 +1336,7 @@ class Container3DView(QOpenGLWidget):
         if not enabled:
             self.selected_cargo_index = -1
             self.dragging = False
-        self.update()
+        self._update_camera()
     
     def check_collision(self, placed: 'PlacedCargo', new_x: float, new_y: float, new_z: float, exclude_index: int = -1) -> bool:
         """检查货物在新位置是否与其他货物碰撞
@@ -1037,7 +1466,7 @@ class Container3DView(QOpenGLWidget):
         
         placed.x = new_x
         placed.y = new_y
-        self.update()
+        self._cargo_changed(self.selected_cargo_index)
         
         if self.on_cargo_rotated:
             self.on_cargo_rotated(self.selected_cargo_index)
@@ -1072,7 +1501,7 @@ class Container3DView(QOpenGLWidget):
         placed.x = new_x
         placed.y = new_y
         placed.z = new_z
-        self.update()
+        self._cargo_changed(self.selected_cargo_index)
         
         if self.on_cargo_moved:
             self.on_cargo_moved(self.selected_cargo_index)
@@ -1118,12 +1547,36 @@ class Container3DView(QOpenGLWidget):
         
         self.update()
     
+    def _cargo_changed(self, index: int):
+        """单个货物位置/朝向变化：只更新网格中该货物的顶点后重绘"""
+        if not self.is_overview_mode():
+            self._cargo_vbo_patches.add(index)
+        else:
+            self._cargo_vbo_dirty = True
+        self._update_camera()
+    
     def is_overview_mode(self) -> bool:
         """是否处于全局概览模式"""
         return self.current_container_index < 0 and len(self.all_container_results) >= 1
     
+    def update(self, *args):
+        """请求重绘（标记场景和货物网格已变化），参数原样转给 QWidget.update（QRect/QRegion 重载）"""
+        self._cargo_vbo_dirty = True
+        self._scene_dirty = True
+        super().update(*args)
+    
+    def _update_camera(self):
+        """仅视角/选中状态变化时请求重绘，复用已上传的货物网格"""
+        self._scene_dirty = True
+        super().update()
+    
     def initializeGL(self):
         """初始化OpenGL"""
+        self._scene_fbo = None
+        self._scene_dirty = True
+        self._cargo_vbo = None
+        self._cargo_vbo_dirty = True
+        self._cargo_vbo_patches.clear()
         glClearColor(0.15, 0.15, 0.18, 1.0)
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_LIGHTING)
@@ -1142,10 +1595,27 @@ class Container3DView(QOpenGLWidget):
         # 仅启用线条抗锯齿，不启用多边形抗锯齿（会产生斜线）
         glEnable(GL_LINE_SMOOTH)
         glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
+        
+        # 集装箱半透明面的交错数组 (r,g,b,a, nx,ny,nz, x,y,z)，按单位立方体构建，绘制时再缩放
+        faces = [
+            ((0.5, 0.5, 0.55, 0.35), [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)]),   # 底面 - 稍深一点
+            ((0.4, 0.4, 0.45, 0.15), [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)]),   # 顶面 - 很透明
+            ((0.45, 0.45, 0.5, 0.2), [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)]),   # 前面 (z=0)
+            ((0.45, 0.45, 0.5, 0.2), [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]),   # 后面 (z=w)
+            ((0.4, 0.4, 0.45, 0.2), [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)]),    # 左面 (x=0)
+            ((0.4, 0.4, 0.45, 0.2), [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)]),    # 右面 (x=l)
+        ]
+        self._container_face_array = np.array(
+            [(*rgba, 0, 0, 0, *v) for rgba, verts in faces for v in verts], dtype=np.float32)
     
     def resizeGL(self, w, h):
         """调整视口"""
-        glViewport(0, 0, w, h)
+        self._scene_dirty = True
+        self._set_viewport(0, 0, w, h)
+    
+    def _set_viewport(self, x: int, y: int, w: int, h: int):
+        """设置视口及与之宽高比一致的透视投影"""
+        glViewport(x, y, w, h)
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
         aspect = w / h if h > 0 else 1
@@ -1154,6 +1624,21 @@ class Container3DView(QOpenGLWidget):
     
     def paintGL(self):
         """渲染场景"""
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        w, h = int(viewport[2]), int(viewport[3])
+        
+        # 场景未变化（如拾取后恢复画面）时直接复制缓存帧
+        if not self._scene_dirty and self._blit_scene_cache(w, h, store=False):
+            return
+        
+        self._render_scene()
+        
+        self._scene_dirty = False
+        if self._scene_fbo is not False:
+            self._blit_scene_cache(w, h, store=True)
+    
+    def _render_scene(self):
+        """绘制整个场景到当前绑定的帧缓冲"""
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         glLoadIdentity()
         
@@ -1166,6 +1651,57 @@ class Container3DView(QOpenGLWidget):
         else:
             self.paintGL_single()
     
+    def _blit_scene_cache(self, w: int, h: int, store: bool) -> bool:
+        """在默认帧缓冲与缓存FBO之间复制当前帧
+        store=True 保存当前帧到缓存，False 从缓存恢复；不支持FBO（缓存已关闭）时返回False"""
+        if self._scene_fbo is False:
+            return False
+        default_fbo = self.defaultFramebufferObject()
+        try:
+            if store and (self._scene_fbo is None or self._scene_fbo_size != (w, h)):
+                self._release_scene_cache()
+                # 每生成一个对象就记下来，中途出错时 _release_scene_cache 也能释放（删除名字0是空操作）
+                fbo = glGenFramebuffers(1)
+                self._scene_fbo, self._scene_fbo_size = (fbo, 0), (0, 0)
+                rbo = glGenRenderbuffers(1)
+                self._scene_fbo = (fbo, rbo)
+                glBindRenderbuffer(GL_RENDERBUFFER, rbo)
+                glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, w, h)
+                glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+                glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, rbo)
+                self._scene_fbo_size = (w, h)
+            
+            if self._scene_fbo is None or self._scene_fbo_size != (w, h):
+                return False
+            
+            cache_fbo = self._scene_fbo[0]
+            src, dst = (default_fbo, cache_fbo) if store else (cache_fbo, default_fbo)
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, src)
+            glBindFramebuffer(GL_DRAW_FRAMEBUFFER, dst)
+            glBlitFramebuffer(0, 0, w, h, 0, 0, w, h, GL_COLOR_BUFFER_BIT, GL_NEAREST)
+            return True
+        except (GLError, NullFunctionError):
+            # 驱动不支持FBO：释放已创建的对象并关闭帧缓存，之后不再尝试
+            try:
+                self._release_scene_cache()
+            except (GLError, NullFunctionError):
+                pass
+            self._scene_fbo = False
+            return False
+        finally:
+            try:
+                glBindFramebuffer(GL_FRAMEBUFFER, default_fbo)
+            except NullFunctionError:
+                pass  # 没有FBO接口时无需恢复绑定
+    
+    def _release_scene_cache(self):
+        """释放缓存FBO（缓存已关闭时保持关闭）"""
+        if self._scene_fbo:
+            fbo, rbo = self._scene_fbo
+            glDeleteFramebuffers(1, [fbo])
+            glDeleteRenderbuffers(1, [rbo])
+            self._scene_fbo = None
+    
     def paintGL_single(self):
         """渲染单个集装箱场景"""
         # 计算观察距离 - 使用1.8让视图更近
@@ -1186,9 +1722,11 @@ class Container3DView(QOpenGLWidget):
         # 绘制集装箱
         self.draw_container_wireframe()
         
-        # 绘制已放置的货物（带索引用于选择）
-        for i, placed in enumerate(self.placed_cargos):
-            self.draw_cargo(placed, i)
+        # 绘制已放置的货物（选中的货物单独高亮绘制）
+        selected = self.selected_cargo_index if self.drag_mode else -1
+        if not self.draw_cargo_mesh(selected):
+            for i, placed in enumerate(self.placed_cargos):
+                self.draw_cargo(placed, i)
         
         # 绘制坐标轴
         self.draw_axes()
@@ -1202,10 +1740,13 @@ class Container3DView(QOpenGLWidget):
         num_containers = len(self.all_container_results)
         if num_containers == 0:
             return
+        if self.overview_tiled and num_containers > 1:
+            self.paintGL_overview_tiled()
+            return
         
         # 计算所有集装箱的布局
         # 集装箱并排放置，中间留有间隙
-        spacing = 200  # 集装箱之间的间隙 (cm) - 增加间距便于区分
+        spacing = self.overview_spacing
         
         # 计算总宽度和最大尺寸
         total_length = 0
@@ -1235,6 +1776,8 @@ class Container3DView(QOpenGLWidget):
         # 绘制扩展的地面网格
         self.draw_overview_grid(total_length, max_width)
         
+        use_mesh = self._ensure_cargo_mesh()
+        
         # 依次绘制每个集装箱
         x_offset = 0
         for idx, result in enumerate(self.all_container_results):
@@ -1248,9 +1791,10 @@ class Container3DView(QOpenGLWidget):
             # 绘制集装箱线框
             self.draw_container_wireframe_at(container)
             
-            # 绘制货物
-            for i, placed in enumerate(placed_cargos):
-                self.draw_cargo(placed, i)
+            # 绘制货物（不支持VBO时逐个绘制，否则在循环结束后统一绘制）
+            if not use_mesh:
+                for i, placed in enumerate(placed_cargos):
+                    self.draw_cargo(placed, i)
             
             # 绘制集装箱编号标签
             self.draw_container_label(idx + 1, container)
@@ -1259,9 +1803,66 @@ class Container3DView(QOpenGLWidget):
             
             x_offset += container.length + spacing
         
+        # 所有集装箱的货物已按各自偏移合并在一个网格里，一次绘制
+        if use_mesh:
+            self.draw_cargo_mesh()
+        
         # 绘制坐标轴
         self.draw_axes()
     
+    def paintGL_overview_tiled(self):
+        """全局概览分块渲染：视口按 cols x rows 划分，每个集装箱一个分块，
+        同一次绘制中依次切换 glViewport，共用同一个货物网格VBO"""
+        results = self.all_container_results
+        cols = math.ceil(math.sqrt(len(results)))
+        rows = math.ceil(len(results) / cols)
+        vx, vy, w, h = (int(v) for v in glGetIntegerv(GL_VIEWPORT))
+        tile_w, tile_h = w // cols, h // rows
+        
+        # 分块为竖长条时按宽高比拉远相机，保证集装箱完整落在分块内
+        fit = max(1.0, tile_h / tile_w) if tile_w > 0 else 1.0
+        
+        use_mesh = self._ensure_cargo_mesh()
+        first = 0
+        x_offset = 0
+        try:
+            for idx, result in enumerate(results):
+                container = result.container
+                row, col = divmod(idx, cols)
+                # 第一行在视口顶部
+                self._set_viewport(vx + col * tile_w, vy + h - (row + 1) * tile_h, tile_w, tile_h)
+                
+                # 每个分块用与单箱视图相同的相机对准自己的集装箱
+                glLoadIdentity()
+                max_dim = max(container.length, container.width, container.height)
+                distance = max_dim * 1.8 * fit / self.zoom
+                glTranslatef(self.pan_x, self.pan_y, -distance)
+                glRotatef(self.rotation_x, 1, 0, 0)
+                glRotatef(self.rotation_y, 0, 1, 0)
+                glTranslatef(-container.length/2, -container.height/2, -container.width/2)
+                
+                self.draw_overview_grid(container.length, container.width)
+                self.draw_container_wireframe_at(container)
+                
+                count = len(result.placed_cargos)
+                if use_mesh:
+                    # 网格中的货物已按并排布局平移，移回原点后只绘制本箱的货物段
+                    glPushMatrix()
+                    glTranslatef(-x_offset, 0, 0)
+                    self.draw_cargo_mesh(cargo_range=(first, first + count))
+                    glPopMatrix()
+                else:
+                    for i, placed in enumerate(result.placed_cargos):
+                        self.draw_cargo(placed, i)
+                
+                self.draw_container_label(idx + 1, container)
+                self.draw_axes()
+                
+                first += count
+                x_offset += container.length + self.overview_spacing
+        finally:
+            self._set_viewport(vx, vy, w, h)
+    
     def draw_overview_grid(self, total_length: float, max_width: float):
         """绘制全局概览的地面网格"""
         glDisable(GL_LIGHTING)
@@ -1323,34 +1924,60 @@ class Container3DView(QOpenGLWidget):
         glEnable(GL_LIGHTING)
     
     def capture_image(self, width: int = 800, height: int = 600) -> 'QImage':
-        """捕获当前3D视图为图片"""
-        from PyQt6.QtCore import QSize
+        """捕获当前3D视图为图片（渲染到指定尺寸的离屏FBO，不改变控件尺寸）"""
         from PyQt6.QtGui import QImage
         
-        # 保存当前尺寸
-        old_size = self.size()
-        
-        # 调整到目标尺寸并渲染
-        self.resize(width, height)
+        data = self.read_pixels(width, height)
+        # OpenGL 原点在左下角，需要上下翻转
+        return QImage(data, width, height, width * 3, QImage.Format.Format_RGB888).mirrored(False, True)
+    
+    def read_pixels(self, width: int = 800, height: int = 600):
+        """把当前3D视图渲染到指定尺寸的离屏FBO并读回像素
+        返回 glReadPixels 的原始RGB数据：每行 width*3 字节、无对齐填充，行序自下而上"""
         self.makeCurrent()
-        self.resizeGL(width, height)
-        self.paintGL()
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        # 导出时调用方可能直接替换了 container/placed_cargos，截图前重建货物网格
+        self._cargo_vbo_dirty = True
+        
+        # 创建离屏帧缓冲（颜色+深度）
+        fbo = glGenFramebuffers(1)
+        color_rb, depth_rb = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, color_rb)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, depth_rb)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color_rb)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth_rb)
         
-        # 捕获帧缓冲
-        image = self.grabFramebuffer()
+        try:
+            # 按目标尺寸设置视口和投影后渲染
+            self.resizeGL(width, height)
+            self._render_scene()
+            glFinish()
+            
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
+            data = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
+        finally:
+            # 恢复控件自身的帧缓冲、视口和投影
+            glBindFramebuffer(GL_FRAMEBUFFER, self.defaultFramebufferObject())
+            glDeleteRenderbuffers(2, [color_rb, depth_rb])
+            glDeleteFramebuffers(1, [fbo])
+            self.resizeGL(int(viewport[2]), int(viewport[3]))
         
-        # 恢复尺寸
-        self.resize(old_size)
-        self.makeCurrent()
-        self.resizeGL(old_size.width(), old_size.height())
         self.update()
-        
-        return image
+        return data
     
     def capture_isometric_image(self, width: int = 800, height: int = 600) -> 'QImage':
         """捕获等轴测视角的图片"""
-        from PyQt6.QtGui import QImage
-        
+        return self._at_isometric_view(self.capture_image, width, height)
+    
+    def read_isometric_pixels(self, width: int = 800, height: int = 600):
+        """以等轴测视角渲染并读回原始RGB像素（格式同 read_pixels）"""
+        return self._at_isometric_view(self.read_pixels, width, height)
+    
+    def _at_isometric_view(self, capture, width: int, height: int):
+        """临时切换到等轴测视角调用 capture(width, height)，之后恢复原视角"""
         # 保存当前视角
         old_rot_x = self.rotation_x
         old_rot_y = self.rotation_y
@@ -1366,14 +1993,15 @@ class Container3DView(QOpenGLWidget):
         self.pan_y = 0
         
         # 捕获图片
-        image = self.capture_image(width, height)
-        
-        # 恢复视角
-        self.rotation_x = old_rot_x
-        self.rotation_y = old_rot_y
-        self.zoom = old_zoom
-        self.pan_x = old_pan_x
-        self.pan_y = old_pan_y
+        try:
+            image = capture(width, height)
+        finally:
+            # 恢复视角
+            self.rotation_x = old_rot_x
+            self.rotation_y = old_rot_y
+            self.zoom = old_zoom
+            self.pan_x = old_pan_x
+            self.pan_y = old_pan_y
         
         self.update()
         return image
@@ -1405,61 +2033,28 @@ class Container3DView(QOpenGLWidget):
     
     def draw_container_wireframe(self):
         """绘制集装箱（半透明面+线框）"""
-        l, w, h = self.container.length, self.container.width, self.container.height
+        self.draw_container_wireframe_at(self.container)
+    
+    def draw_container_wireframe_at(self, container):
+        """绘制指定集装箱（半透明面+线框）- 也用于概览模式"""
+        l, w, h = container.length, container.width, container.height
         
         glDisable(GL_LIGHTING)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         glDepthMask(GL_FALSE)  # 禁用深度写入，让透明面正确显示
         
-        # 绘制半透明的所有面
-        glBegin(GL_QUADS)
-        
-        # 底面 - 稍深一点
-        glColor4f(0.5, 0.5, 0.55, 0.35)
-        glVertex3f(0, 0, 0)
-        glVertex3f(l, 0, 0)
-        glVertex3f(l, 0, w)
-        glVertex3f(0, 0, w)
-        
-        # 顶面 - 很透明
-        glColor4f(0.4, 0.4, 0.45, 0.15)
-        glVertex3f(0, h, 0)
-        glVertex3f(0, h, w)
-        glVertex3f(l, h, w)
-        glVertex3f(l, h, 0)
-        
-        # 前面 (z=0) - 半透明
-        glColor4f(0.45, 0.45, 0.5, 0.2)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, h, 0)
-        glVertex3f(l, h, 0)
-        glVertex3f(l, 0, 0)
-        
-        # 后面 (z=w) - 半透明
-        glColor4f(0.45, 0.45, 0.5, 0.2)
-        glVertex3f(0, 0, w)
-        glVertex3f(l, 0, w)
-        glVertex3f(l, h, w)
-        glVertex3f(0, h, w)
-        
-        # 左面 (x=0) - 半透明
-        glColor4f(0.4, 0.4, 0.45, 0.2)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, w)
-        glVertex3f(0, h, w)
-        glVertex3f(0, h, 0)
-        
-        # 右面 (x=l) - 半透明
-        glColor4f(0.4, 0.4, 0.45, 0.2)
-        glVertex3f(l, 0, 0)
-        glVertex3f(l, h, 0)
-        glVertex3f(l, h, w)
-        glVertex3f(l, 0, w)
-        
-        glEnd()
+        # 绘制半透明的所有面：单位立方体的颜色+顶点交错数组，一次glDrawArrays提交
+        glPushMatrix()
+        glScalef(l, h, w)
+        glInterleavedArrays(GL_C4F_N3F_V3F, 0, self._container_face_array)
+        glDrawArrays(GL_QUADS, 0, 24)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopMatrix()
         
-        glDepthMask(GL_TRUE)  # 恢复深度写入
+        glDepthMask(GL_TRUE)
         
         # 绘制边框线
         glColor4f(0.8, 0.8, 0.85, 1.0)
@@ -1490,99 +2085,172 @@ class Container3DView(QOpenGLWidget):
         
         glEnable(GL_LIGHTING)
     
-    def draw_container_wireframe_at(self, container):
-        """绘制指定集装箱（半透明面+线框）- 用于概览模式"""
-        l, w, h = container.length, container.width, container.height
+    def _build_cargo_mesh(self):
+        """把所有货物合并成面/边框两个交错顶点数组并上传到VBO"""
+        if self.is_overview_mode():
+            # 概览模式：各集装箱的货物沿长度方向平移后合并
+            groups = [result.placed_cargos for result in self.all_container_results]
+            offsets = np.cumsum([0] + [r.container.length + self.overview_spacing for r in self.all_container_results[:-1]])
+            placed_cargos = [p for group in groups for p in group]
+            shift = np.repeat(offsets, [len(group) for group in groups]).astype(np.float32)
+        else:
+            placed_cargos = self.placed_cargos
+            shift = 0
+        
+        faces, edges = self._cargo_mesh_arrays(PlacedCargoArrays.from_placed(placed_cargos), shift)
+        self._cargo_bounds = self._cargo_mesh_bounds(faces)
+        
+        if self._cargo_vbo is None:
+            self._cargo_vbo = tuple(int(b) for b in glGenBuffers(2))
+        for vbo, arr in zip(self._cargo_vbo, (faces, edges)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, arr.nbytes, arr, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
+        self._cargo_vertex_count = len(placed_cargos) * 24
+        self._cargo_vbo_dirty = False
+        self._cargo_vbo_patches.clear()
+    
+    def _patch_cargo_mesh(self):
+        """用 glBufferSubData 只重写发生变化的货物的顶点，代价与货物总数无关"""
+        count = min(self._cargo_vertex_count // 24, len(self.placed_cargos))
+        for index in self._cargo_vbo_patches:
+            if index < count:
+                arrays = PlacedCargoArrays.from_placed([self.placed_cargos[index]])
+                mesh = self._cargo_mesh_arrays(arrays)
+                self._cargo_bounds[index] = self._cargo_mesh_bounds(mesh[0])[0]
+                for vbo, arr in zip(self._cargo_vbo, mesh):
+                    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+                    glBufferSubData(GL_ARRAY_BUFFER, index * arr.nbytes, arr.nbytes, arr)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._cargo_vbo_patches.clear()
+    
+    @staticmethod
+    def _cargo_mesh_arrays(arrays: PlacedCargoArrays, shift=0) -> tuple:
+        """生成货物的面/边框交错顶点数组，shift 为每个货物沿长度方向的平移"""
+        n = len(arrays)
+        # 换算到GL坐标: 位置(x, z, y)、尺寸(l, h, w)
+        gl_axes = [0, 2, 1]
+        pos = arrays.positions[:, None, gl_axes].astype(np.float32)
+        size = arrays.sizes[:, None, gl_axes].astype(np.float32)
+        rgb = arrays.colors[:, None, :].astype(np.float32)
+        pos[:, 0, 0] += shift
+        
+        # 面: (r,g,b, nx,ny,nz, x,y,z) 共 N*24 个顶点
+        faces = np.empty((n, 24, 9), dtype=np.float32)
+        faces[..., 0:3] = rgb
+        faces[..., 3:6] = _UNIT_CUBE_NORMALS
+        faces[..., 6:9] = pos + _UNIT_CUBE_QUADS * size
+        
+        # 边框: 货物颜色的深色版本 (r,g,b,a, x,y,z) 共 N*24 个顶点
+        edges = np.empty((n, 24, 7), dtype=np.float32)
+        edges[..., 0:3] = rgb * 0.3
+        edges[..., 3] = 0.8
+        edges[..., 4:7] = pos + _UNIT_CUBE_EDGES * size
+        return faces, edges
+    
+    @staticmethod
+    def _cargo_mesh_bounds(faces: np.ndarray) -> np.ndarray:
+        """由面顶点数组求每个货物的包围盒 (N,2,3)"""
+        xyz = faces[..., 6:9]
+        return np.stack([xyz.min(axis=1), xyz.max(axis=1)], axis=1)
+    
+    def _visible_cargo_mask(self) -> np.ndarray:
+        """视锥剔除：用当前投影和模型视图矩阵求6个裁剪平面 (Gribb/Hartmann)，
+        返回包围盒与视锥相交的货物掩码"""
+        bounds = self._cargo_bounds
+        # OpenGL 矩阵按列存储，读出后转置得到常规的行主序矩阵
+        proj = np.asarray(glGetDoublev(GL_PROJECTION_MATRIX), dtype=np.float64).reshape(4, 4).T
+        modelview = np.asarray(glGetDoublev(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4).T
+        mvp = proj @ modelview
+        planes = np.concatenate([mvp[3] + mvp[:3], mvp[3] - mvp[:3]])  # (6,4): 左下近、右上远
+        
+        centers = (bounds[:, 0] + bounds[:, 1]) * 0.5
+        extents = (bounds[:, 1] - bounds[:, 0]) * 0.5
+        # 包围盒在平面法线方向上最靠外的点仍在平面背面，则整个盒子在视锥外
+        dist = centers @ planes[:, :3].T + extents @ np.abs(planes[:, :3]).T + planes[:, 3]
+        return (dist >= 0).all(axis=1)
+    
+    def _ensure_cargo_mesh(self) -> bool:
+        """货物变化后重建网格VBO；驱动不支持VBO时返回False"""
+        if self._cargo_vbo is False:
+            return False
+        try:
+            if self._cargo_vbo_dirty or self._cargo_vbo is None:
+                self._build_cargo_mesh()
+            elif self._cargo_vbo_patches:
+                self._patch_cargo_mesh()
+        except (GLError, NullFunctionError):
+            # 只有GL调用失败才认为驱动不支持VBO；网格构建本身的错误照常抛出
+            self._cargo_vbo = False
+            return False
+        return True
+    
+    def draw_cargo_mesh(self, selected: int = -1, cargo_range: Optional[Tuple[int, int]] = None) -> bool:
+        """用合并后的VBO绘制所有货物，selected 指定的货物跳过并单独高亮绘制
+        cargo_range=(起, 止) 时只绘制网格中该索引区间的货物
+        驱动不支持VBO时返回False，由调用方逐个绘制"""
+        if not self._ensure_cargo_mesh():
+            return False
         
+        n = self._cargo_vertex_count // 24
+        if not 0 <= selected < n:
+            selected = -1
+        # 只绘制视锥内的货物，连续的可见货物合并成一段
+        visible = self._visible_cargo_mask()
+        if cargo_range is not None:
+            visible[:cargo_range[0]] = False
+            visible[cargo_range[1]:] = False
+        if selected >= 0:
+            visible[selected] = False
+        firsts, counts = self._visible_runs(visible)
+        
+        face_vbo, edge_vbo = self._cargo_vbo
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        
+        # 面
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, face_vbo)
+        glColorPointer(3, GL_FLOAT, 36, ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT, 36, ctypes.c_void_p(12))
+        glVertexPointer(3, GL_FLOAT, 36, ctypes.c_void_p(24))
+        if len(firsts):
+            glMultiDrawArrays(GL_QUADS, firsts, counts, len(firsts))
+        glDisableClientState(GL_NORMAL_ARRAY)
+        
+        # 边框
         glDisable(GL_LIGHTING)
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        glDepthMask(GL_FALSE)
-        
-        # 绘制半透明的所有面
-        glBegin(GL_QUADS)
-        
-        # 底面
-        glColor4f(0.5, 0.5, 0.55, 0.35)
-        glVertex3f(0, 0, 0)
-        glVertex3f(l, 0, 0)
-        glVertex3f(l, 0, w)
-        glVertex3f(0, 0, w)
-        
-        # 顶面
-        glColor4f(0.4, 0.4, 0.45, 0.15)
-        glVertex3f(0, h, 0)
-        glVertex3f(0, h, w)
-        glVertex3f(l, h, w)
-        glVertex3f(l, h, 0)
-        
-        # 前面
-        glColor4f(0.45, 0.45, 0.5, 0.2)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, h, 0)
-        glVertex3f(l, h, 0)
-        glVertex3f(l, 0, 0)
-        
-        # 后面
-        glColor4f(0.45, 0.45, 0.5, 0.2)
-        glVertex3f(0, 0, w)
-        glVertex3f(l, 0, w)
-        glVertex3f(l, h, w)
-        glVertex3f(0, h, w)
-        
-        # 左面
-        glColor4f(0.4, 0.4, 0.45, 0.2)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, w)
-        glVertex3f(0, h, w)
-        glVertex3f(0, h, 0)
-        
-        # 右面
-        glColor4f(0.4, 0.4, 0.45, 0.2)
-        glVertex3f(l, 0, 0)
-        glVertex3f(l, h, 0)
-        glVertex3f(l, h, w)
-        glVertex3f(l, 0, w)
-        
-        glEnd()
-        
-        glDepthMask(GL_TRUE)
-        
-        # 绘制边框线
-        glColor4f(0.8, 0.8, 0.85, 1.0)
-        glLineWidth(2)
-        
-        # 底面边框
-        glBegin(GL_LINE_LOOP)
-        glVertex3f(0, 0, 0)
-        glVertex3f(l, 0, 0)
-        glVertex3f(l, 0, w)
-        glVertex3f(0, 0, w)
-        glEnd()
-        
-        # 顶面边框
-        glBegin(GL_LINE_LOOP)
-        glVertex3f(0, h, 0)
-        glVertex3f(l, h, 0)
-        glVertex3f(l, h, w)
-        glVertex3f(0, h, w)
-        glEnd()
+        glLineWidth(1.0)
+        glBindBuffer(GL_ARRAY_BUFFER, edge_vbo)
+        glColorPointer(4, GL_FLOAT, 28, ctypes.c_void_p(0))
+        glVertexPointer(3, GL_FLOAT, 28, ctypes.c_void_p(16))
+        if len(firsts):
+            glMultiDrawArrays(GL_LINES, firsts, counts, len(firsts))
+        glEnable(GL_LIGHTING)
         
-        # 竖直边
-        glBegin(GL_LINES)
-        for x, z in [(0, 0), (l, 0), (l, w), (0, w)]:
-            glVertex3f(x, 0, z)
-            glVertex3f(x, h, z)
-        glEnd()
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
         
-        glEnable(GL_LIGHTING)
+        if selected >= 0:
+            self.draw_cargo(self.placed_cargos[selected], selected)
+        return True
+    
+    @staticmethod
+    def _visible_runs(visible: np.ndarray) -> tuple:
+        """把可见货物掩码转换成 glMultiDrawArrays 的 (起始顶点, 顶点数) 数组"""
+        edges = np.diff(np.concatenate(([0], visible.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return (starts * 24).astype(np.int32), ((ends - starts) * 24).astype(np.int32)
     
     def draw_cargo(self, placed: PlacedCargo, index: int = -1):
-        """绘制货物"""
-        x, y, z = placed.x, placed.z, placed.y
-        l = placed.actual_length
-        h = placed.cargo.height
-        w = placed.actual_width
+        """绘制货物（用该SKU预缩放好的几何，只做平移）"""
+        faces, edges = placed.cargo.gl_geometry(placed.rotated)
+        origin = np.array([placed.x, placed.z, placed.y], dtype=np.float32)
+        faces = faces + origin
+        edges = edges + origin
         
         r, g, b = placed.cargo.color
         
@@ -1593,35 +2261,15 @@ class Container3DView(QOpenGLWidget):
             g = min(1.0, g + 0.3)
             b = min(1.0, b + 0.3)
         
-        # 定义顶点
-        vertices = [
-            (x, y, z), (x+l, y, z), (x+l, y, z+w), (x, y, z+w),
-            (x, y+h, z), (x+l, y+h, z), (x+l, y+h, z+w), (x, y+h, z+w)
-        ]
-        
         glColor3f(r, g, b)
         
         # 绘制面
-        glBegin(GL_QUADS)
-        # 底面
-        glNormal3f(0, -1, 0)
-        glVertex3f(*vertices[0]); glVertex3f(*vertices[1]); glVertex3f(*vertices[2]); glVertex3f(*vertices[3])
-        # 顶面
-        glNormal3f(0, 1, 0)
-        glVertex3f(*vertices[4]); glVertex3f(*vertices[7]); glVertex3f(*vertices[6]); glVertex3f(*vertices[5])
-        # 前面
-        glNormal3f(0, 0, -1)
-        glVertex3f(*vertices[0]); glVertex3f(*vertices[4]); glVertex3f(*vertices[5]); glVertex3f(*vertices[1])
-        # 后面
-        glNormal3f(0, 0, 1)
-        glVertex3f(*vertices[2]); glVertex3f(*vertices[6]); glVertex3f(*vertices[7]); glVertex3f(*vertices[3])
-        # 左面
-        glNormal3f(-1, 0, 0)
-        glVertex3f(*vertices[0]); glVertex3f(*vertices[3]); glVertex3f(*vertices[7]); glVertex3f(*vertices[4])
-        # 右面
-        glNormal3f(1, 0, 0)
-        glVertex3f(*vertices[1]); glVertex3f(*vertices[5]); glVertex3f(*vertices[6]); glVertex3f(*vertices[2])
-        glEnd()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glNormalPointer(GL_FLOAT, 0, _UNIT_CUBE_NORMALS)
+        glVertexPointer(3, GL_FLOAT, 0, faces)
+        glDrawArrays(GL_QUADS, 0, len(faces))
+        glDisableClientState(GL_NORMAL_ARRAY)
         
         # 绘制边框 - 使用更柔和的颜色和适当的线宽
         glDisable(GL_LIGHTING)
@@ -1638,17 +2286,9 @@ class Container3DView(QOpenGLWidget):
             glColor4f(r * 0.3, g * 0.3, b * 0.3, 0.8)
             glLineWidth(1.0)
         
-        edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0),
-            (4, 5), (5, 6), (6, 7), (7, 4),
-            (0, 4), (1, 5), (2, 6), (3, 7)
-        ]
-        
-        glBegin(GL_LINES)
-        for i, j in edges:
-            glVertex3f(*vertices[i])
-            glVertex3f(*vertices[j])
-        glEnd()
+        glVertexPointer(3, GL_FLOAT, 0, edges)
+        glDrawArrays(GL_LINES, 0, len(edges))
+        glDisableClientState(GL_VERTEX_ARRAY)
         
         glDisable(GL_POLYGON_OFFSET_LINE)
         glEnable(GL_LIGHTING)
@@ -1750,15 +2390,20 @@ class Container3DView(QOpenGLWidget):
         glRotatef(self.rotation_y, 0, 1, 0)
         glTranslatef(-self.container.length/2, -self.container.height/2, -self.container.width/2)
         
-        # 用唯一颜色绘制每个货物
-        for i, placed in enumerate(self.placed_cargos):
-            # 将索引编码为颜色 (索引+1，因为0是背景)
-            idx = i + 1
-            r = (idx & 0xFF) / 255.0
-            g = ((idx >> 8) & 0xFF) / 255.0
-            b = ((idx >> 16) & 0xFF) / 255.0
-            glColor3f(r, g, b)
-            self.draw_cargo_for_picking(placed)
+        # 用唯一颜色绘制所有货物（顶点和颜色数组一次提交）
+        n = len(self.placed_cargos)
+        boxes = np.array([(p.x, p.z, p.y, p.actual_length, p.cargo.height, p.actual_width)
+                          for p in self.placed_cargos], dtype=np.float32)
+        vertices = (boxes[:, None, :3] + _UNIT_CUBE_QUADS[None] * boxes[:, None, 3:]).reshape(-1, 3)
+        pick_colors = np.repeat(self._get_pick_colors(n), len(_UNIT_CUBE_QUADS), axis=0)
+        
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, vertices)
+        glColorPointer(3, GL_UNSIGNED_BYTE, 0, pick_colors)
+        glDrawArrays(GL_QUADS, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
         
         glFlush()
         glFinish()
@@ -1776,8 +2421,8 @@ class Container3DView(QOpenGLWidget):
         # 恢复状态
         glPopAttrib()
         
-        # 重新绘制正常场景
-        self.update()
+        # 重新绘制正常场景（场景本身未变化，直接从缓存帧恢复）
+        super().update()
         
         # 解码颜色为索引
         if pixel:
@@ -1788,28 +2433,13 @@ class Container3DView(QOpenGLWidget):
         
         return -1
     
-    def draw_cargo_for_picking(self, placed: PlacedCargo):
-        """绘制用于拾取的货物（简化版）"""
-        x, y, z = placed.x, placed.z, placed.y
-        l = placed.actual_length
-        h = placed.cargo.height
-        w = placed.actual_width
-        
-        glBegin(GL_QUADS)
-        # 简单绘制六个面
-        # 底面
-        glVertex3f(x, y, z); glVertex3f(x+l, y, z); glVertex3f(x+l, y, z+w); glVertex3f(x, y, z+w)
-        # 顶面
-        glVertex3f(x, y+h, z); glVertex3f(x, y+h, z+w); glVertex3f(x+l, y+h, z+w); glVertex3f(x+l, y+h, z)
-        # 前面
-        glVertex3f(x, y, z); glVertex3f(x, y+h, z); glVertex3f(x+l, y+h, z); glVertex3f(x+l, y, z)
-        # 后面
-        glVertex3f(x, y, z+w); glVertex3f(x+l, y, z+w); glVertex3f(x+l, y+h, z+w); glVertex3f(x, y+h, z+w)
-        # 左面
-        glVertex3f(x, y, z); glVertex3f(x, y, z+w); glVertex3f(x, y+h, z+w); glVertex3f(x, y+h, z)
-        # 右面
-        glVertex3f(x+l, y, z); glVertex3f(x+l, y+h, z); glVertex3f(x+l, y+h, z+w); glVertex3f(x+l, y, z+w)
-        glEnd()
+    def _get_pick_colors(self, count: int) -> np.ndarray:
+        """获取索引编码颜色 (索引+1 编码为RGB，0为背景)"""
+        if self._pick_colors is None or len(self._pick_colors) < count:
+            ids = np.arange(1, count + 1, dtype=np.uint32)
+            self._pick_colors = np.stack([ids & 0xFF, (ids >> 8) & 0xFF, (ids >> 16) & 0xFF],
+                                         axis=1).astype(np.uint8)
+        return self._pick_colors[:count]
     
     def mousePressEvent(self, event):
         """鼠标按下"""
@@ -1829,10 +2459,10 @@ class Container3DView(QOpenGLWidget):
                     # 无论是否拖拽模式都触发选中回调
                     if self.on_cargo_selected:
                         self.on_cargo_selected(hit_index)
-                    self.update()
+                    self._update_camera()
                 else:
                     self.selected_cargo_index = -1
-                    self.update()
+                    self._update_camera()
             except Exception:
                 # 如果选择失败，忽略错误
                 pass
@@ -1848,7 +2478,8 @@ class Container3DView(QOpenGLWidget):
         # 拖拽模式下的移动逻辑
         if self.drag_mode and self.dragging and self.selected_cargo_index >= 0:
             if self.selected_cargo_index < len(self.placed_cargos):
-                placed = self.placed_cargos[self.selected_cargo_index]
+                index = self.selected_cargo_index
+                placed = self.placed_cargos[index]
                 # 简单的移动：水平移动改变X，垂直移动按Shift键改变Z，否则改变Y
                 move_scale = self.container.length / 500  # 移动比例
                 
@@ -1859,8 +2490,8 @@ class Container3DView(QOpenGLWidget):
                     new_z = max(0, min(self.container.height - placed.cargo.height, new_z))
                     
                     # 吸附和碰撞检测
-                    snap_x, snap_y, snap_z = self.find_snap_position(placed, placed.x, placed.y, new_z, self.selected_cargo_index)
-                    if not self.collision_enabled or not self.check_collision(placed, placed.x, placed.y, snap_z, self.selected_cargo_index):
+                    snap_x, snap_y, snap_z = self.find_snap_position(placed, placed.x, placed.y, new_z, index)
+                    if not self.collision_enabled or not self.check_collision(placed, placed.x, placed.y, snap_z, index):
                         placed.z = snap_z
                 else:
                     # 正常拖动改变X和Y
@@ -1872,20 +2503,20 @@ class Container3DView(QOpenGLWidget):
                     new_y = max(0, min(self.container.width - placed.actual_width, new_y))
                     
                     # 吸附
-                    snap_x, snap_y, snap_z = self.find_snap_position(placed, new_x, new_y, placed.z, self.selected_cargo_index)
+                    snap_x, snap_y, snap_z = self.find_snap_position(placed, new_x, new_y, placed.z, index)
                     
                     # 碰撞检测
-                    if not self.collision_enabled or not self.check_collision(placed, snap_x, snap_y, placed.z, self.selected_cargo_index):
+                    if not self.collision_enabled or not self.check_collision(placed, snap_x, snap_y, placed.z, index):
                         placed.x = snap_x
                         placed.y = snap_y
-                    elif not self.check_collision(placed, new_x, new_y, placed.z, self.selected_cargo_index):
+                    elif not self.check_collision(placed, new_x, new_y, placed.z, index):
                         # 如果吸附位置有碰撞，使用原始位置
                         placed.x = new_x
                         placed.y = new_y
                     # 如果都有碰撞，不移动
                 
                 self.last_mouse_pos = event.pos()
-                self.update()
+                self._cargo_changed(index)
                 return
         
         if self.mouse_button == Qt.MouseButton.LeftButton and not self.drag_mode:
@@ -1904,7 +2535,7 @@ class Container3DView(QOpenGLWidget):
             self.zoom = max(0.1, min(10, self.zoom))
         
         self.last_mouse_pos = event.pos()
-        self.update()
+        self._update_camera()
     
     def mouseReleaseEvent(self, event):
         """鼠标释放"""
@@ -1922,8 +2553,7 @@ class Container3DView(QOpenGLWidget):
         
         # R键旋转货物
         if event.key() == Qt.Key.Key_R:
-            if self.rotate_selected_cargo():
-                self.update()
+            self.rotate_selected_cargo()
             return
         
         # 方向键微调 (1cm)
@@ -1957,7 +2587,7 @@ class Container3DView(QOpenGLWidget):
         zoom_factor = 1 + delta * 0.0008
         self.zoom *= zoom_factor
         self.zoom = max(0.1, min(10, self.zoom))  # 允许更大的缩放范围
-        self.update()
+        self._update_camera()
     
     def reset_view(self):
         """重置视角"""
@@ -1966,7 +2596,7 @@ class Container3DView(QOpenGLWidget):
         self.zoom = 1.0
         self.pan_x = 0
         self.pan_y = 0
-        self.update()
+        self._update_camera()
     
     def set_view(self, preset: str):
         """设置预设视角"""
@@ -1980,7 +2610,7 @@ class Container3DView(QOpenGLWidget):
         }
         if preset in views:
             self.rotation_x, self.rotation_y = views[preset]
-            self.update()
+            self._update_camera()
 
 
 class CollapsibleGroupBox(QGroupBox):
@@ -2053,46 +2683,227 @@ class CollapsibleGroupBox(QGroupBox):
 
 
 class ModernButton(QPushButton):
-    """现代风格按钮"""
+    """现代风格按钮
+    样式由主窗口样式表中的 STYLE_SHEET 统一提供（按 primary 属性区分），不再逐个按钮解析QSS"""
+    STYLE_SHEET = """
+        ModernButton {
+            background-color: #37474F;
+            color: white;
+            border: 1px solid #546E7A;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-size: 13px;
+        }
+        ModernButton:hover {
+            background-color: #455A64;
+            border-color: #78909C;
+        }
+        ModernButton:pressed {
+            background-color: #263238;
+        }
+        ModernButton[primary="true"] {
+            background-color: #2196F3;
+            border: none;
+            font-weight: bold;
+        }
+        ModernButton[primary="true"]:hover {
+            background-color: #1976D2;
+        }
+        ModernButton[primary="true"]:pressed {
+            background-color: #1565C0;
+        }
+    """
+    
     def __init__(self, text, primary=False, parent=None):
         super().__init__(text, parent)
         self.setMinimumHeight(36)
-        if primary:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-                QPushButton:pressed {
-                    background-color: #1565C0;
-                }
-            """)
+        self.setProperty("primary", primary)
+
+
+class LoadingStepsModel(QAbstractTableModel):
+    """装载步骤表格模型：只保存步骤列表，单元格文本在视图绘制可见行时才生成"""
+    HEADERS = ["序号", "集装箱", "货物名称", "尺寸(cm)", "位置坐标", "加固"]
+    # 各列对应的步骤字段及缺省值（序号列缺省为行号）
+    COLUMNS = (('step', None), ('container', '-'), ('cargo_name', ''),
+               ('dimensions', ''), ('position', ''), ('securing', '标准'))
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[tuple] = []
+    
+    def set_steps(self, steps: list):
+        """整体替换步骤列表
+        步骤可以是 dict（get_loading_steps 的格式），也可以是按列顺序的6元组；
+        dict 在这里一次性转成元组，绘制时按列下标取值"""
+        self.beginResetModel()
+        self._rows = [step if isinstance(step, tuple) else self._step_row(i, step)
+                      for i, step in enumerate(steps)]
+        self.endResetModel()
+    
+    @classmethod
+    def _step_row(cls, i: int, step: dict) -> tuple:
+        # 序号列缺省为行号
+        return tuple(str(step.get(key, i + 1)) if default is None else step.get(key, default)
+                     for key, default in cls.COLUMNS)
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            # 序号、集装箱、货物名称、尺寸、位置坐标、加固建议
+            return self._rows[row][col]
+        if role == Qt.ItemDataRole.TextAlignmentRole and col != 2:
+            # 货物名称左对齐，其余居中
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+
+# Excel“可堆叠”列中视为“是”的取值；True 同时匹配数字 1
+_TRUTHY = frozenset({"true", "True", "TRUE", "是", "1", "yes", "Yes", "YES", True})
+
+
+class ExcelImportSignals(QObject):
+    """ExcelImportTask 的信号（QRunnable 本身不是 QObject，不能定义信号）"""
+    finished = pyqtSignal(list, list)  # 货物列表, 分组列表
+    failed = pyqtSignal(str)
+
+
+class ExcelImportTask(QRunnable):
+    """在线程池中解析货物Excel，避免大表格读取期间界面卡死
+    只构造纯数据的 Cargo/CargoGroup，不接触任何Qt控件，结果通过信号交回界面线程"""
+    
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename
+        self.signals = ExcelImportSignals()
+    
+    def run(self):
+        try:
+            cargos, groups = self.parse(self.filename)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
         else:
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #37474F;
-                    color: white;
-                    border: 1px solid #546E7A;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #455A64;
-                    border-color: #78909C;
-                }
-                QPushButton:pressed {
-                    background-color: #263238;
-                }
-            """)
+            self.signals.finished.emit(cargos, groups)
+    
+    @staticmethod
+    def parse(filename: str) -> Tuple[List[Cargo], List[CargoGroup]]:
+        """读取Excel中的货物和分组"""
+        # 只读模式流式读取，内存占用低；data_only 读取公式的计算结果
+        wb = load_workbook(filename, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            # 跳过标题行，从第2行开始读取；空行跳过，不足11列的行补齐
+            rows = [tuple(row) + (None,) * (11 - len(row))
+                    for row in ws.iter_rows(min_row=2, values_only=True) if row and row[0] is not None]
+        finally:
+            wb.close()
+        
+        cargos = []
+        group_map = {}  # 记录分组ID到货物ID的映射
+        
+        n = len(rows)
+        table = np.array([row[:6] for row in rows], dtype=object).reshape(n, 6)
+        
+        def column(index, default, dtype):
+            """整列转换，空值/0 使用默认值"""
+            values = table[:, index]
+            return np.where(values.astype(bool), values, default).astype(dtype).tolist()
+        
+        lengths = column(1, 100, np.float64)
+        widths = column(2, 80, np.float64)
+        heights = column(3, 60, np.float64)
+        weights = column(4, 50, np.float64)
+        quantities = column(5, 1, np.int64)
+        
+        # 颜色一次性分配
+        colors = [CARGO_COLORS[i % len(CARGO_COLORS)] for i in range(n)]
+        
+        for i, row in enumerate(rows):
+            name = str(row[0]) if row[0] else f"货物{i+1}"
+            # 常见写法直接查集合，其余大小写组合的字符串再转小写
+            flag = row[6]
+            stackable = flag is None or flag in _TRUTHY or (isinstance(flag, str) and flag.lower() in _TRUTHY)
+            
+            # 读取分组信息 (第11列，索引10)
+            group_id = None
+            if row[10]:
+                group_id = str(row[10]).strip()
+            
+            cargo = Cargo(
+                name=name,
+                length=lengths[i],
+                width=widths[i],
+                height=heights[i],
+                weight=weights[i],
+                quantity=quantities[i],
+                stackable=stackable,
+                group_id=group_id,
+                color=colors[i]
+            )
+            cargos.append(cargo)
+            
+            # 记录分组
+            if group_id:
+                if group_id not in group_map:
+                    group_map[group_id] = []
+                group_map[group_id].append(cargo.id)
+        
+        # 创建分组对象
+        groups = [CargoGroup(id=gid, name=f"分组{gid}", cargo_ids=cargo_ids)
+                  for gid, cargo_ids in group_map.items()]
+        return cargos, groups
+
+
+# 长方体8个顶点相对 (x, y, z) 的偏移（乘以 l, w, h）
+# 顺序: 底面 左后/右后/右前/左前, 顶面 左后/右后/右前/左前
+_BOX_CORNER_OFFSETS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+], dtype=np.float64)
+
+
+def _project_cargos(coords: np.ndarray, cos_a: float, sin_a: float, scale: float, cx: float, cy: float):
+    """等轴测投影所有货物
+    coords: (N,6) 的 (x, y, z, l, w, h)；返回 (N,8,2) int32 顶点和 (N,) 绘制深度"""
+    pts = coords[:, None, 0:3] + _BOX_CORNER_OFFSETS[None] * coords[:, None, 3:6]
+    px = (pts[..., 0] - pts[..., 1]) * cos_a * scale + cx
+    py = -(pts[..., 0] + pts[..., 1]) * sin_a * scale - pts[..., 2] * scale + cy
+    depth = coords[:, 0] + coords[:, 1] + coords[:, 2] * 0.5
+    return np.stack([px, py], axis=-1).astype(np.int32), depth
+
+
+if NUMBA_SUPPORT:
+    @njit(cache=NUMBA_CACHE, parallel=True)
+    def _project_cargos_jit(coords, cos_a, sin_a, scale, cx, cy):
+        """_project_cargos 的JIT版本，逐货物并行投影"""
+        n = coords.shape[0]
+        verts = np.empty((n, 8, 2), dtype=np.int32)
+        depth = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            x, y, z = coords[i, 0], coords[i, 1], coords[i, 2]
+            l, w, h = coords[i, 3], coords[i, 4], coords[i, 5]
+            for k in range(8):
+                px = x + (l if k in (1, 2, 5, 6) else 0.0)
+                py = y + (w if k in (2, 3, 6, 7) else 0.0)
+                pz = z + (h if k >= 4 else 0.0)
+                verts[i, k, 0] = np.int32((px - py) * cos_a * scale + cx)
+                verts[i, k, 1] = np.int32(-(px + py) * sin_a * scale - pz * scale + cy)
+            depth[i] = x + y + z * 0.5
+        return verts, depth
+    
+    _project_cargos = _project_cargos_jit
 
 
 class LoadingImageGenerator:
@@ -2103,10 +2914,12 @@ class LoadingImageGenerator:
         self.placed_cargos = placed_cargos
         self.view_3d = view_3d  # 3D视图引用，用于截图
         self.margin = 60  # 边距
-        self.scale = 1.0  # 比例尺
         self.font = None
         self.title_font = None
         self._load_fonts()
+        self._font_cache = {'title': self.title_font, 'body': self.font}
+        self._label_cache: Dict[tuple, tuple] = {}  # (文字, 字体) -> (遮罩, 偏移)
+        self._bg_cache: Dict[tuple, np.ndarray] = {}  # (视图, 宽, 高, 容器轮廓) -> 背景+容器轮廓
     
     def _load_fonts(self):
         """加载中文字体"""
@@ -2149,90 +2962,178 @@ class LoadingImageGenerator:
         
         return min(scale_x, scale_y)
     
-    def generate_top_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
-        """生成俯视图（X-Y平面，从上往下看）"""
-        if not PIL_SUPPORT:
-            return None
-        
-        self.scale = self.calculate_scale(width, height, self.container.length, self.container.width)
-        
-        img = Image.new('RGB', (width, height), color=(240, 240, 245))
-        draw = ImageDraw.Draw(img)
+    def _build_rect_arrays(self, cargos: List[PlacedCargo], axes: str, origin_x: int, origin_y: int, scale: float):
+        """批量计算货物在投影面上的像素矩形和8位颜色
+        axes: 'xy' 俯视, 'xz' 正视, 'yz' 侧视；含z轴时 origin_y 为容器底边（向上为正）
+        返回 xs, ys, ws, hs, colors"""
+        n = len(cargos)
+        data = np.array([(p.x, p.y, p.z, p.actual_length, p.actual_width, p.cargo.height)
+                         for p in cargos], dtype=np.float64).reshape(n, 6)
+        scaled = (data * scale).astype(np.int64)
+        colors = [p.cargo.color_u8 for p in cargos]
+        
+        if axes == 'xy':
+            xs, ys = origin_x + scaled[:, 0], origin_y + scaled[:, 1]
+            ws, hs = scaled[:, 3], scaled[:, 4]
+        else:
+            u = 0 if axes == 'xz' else 1
+            top = ((data[:, 2] + data[:, 5]) * scale).astype(np.int64)
+            xs, ys = origin_x + scaled[:, u], origin_y - top
+            ws, hs = scaled[:, 3 + u], scaled[:, 5]
+        return xs, ys, ws, hs, colors
+    
+    def _text_tile(self, text: str, font) -> tuple:
+        """获取预渲染的文字遮罩（L模式），相同文字只栅格化一次"""
+        key = (text, id(font))
+        tile = self._label_cache.get(key)
+        if tile is None:
+            left, top, right, bottom = font.getbbox(text)
+            ox, oy = -min(left, 0), -min(top, 0)  # 部分字形会超出原点左/上方
+            mask = Image.new('L', (right + ox, bottom + oy), 0)
+            ImageDraw.Draw(mask).text((ox, oy), text, fill=255, font=font)
+            tile = self._label_cache[key] = (mask, ox, oy)
+        return tile
+    
+    def _paste_text(self, img: 'Image.Image', xy: tuple, text: str, font, color: tuple, clip: tuple = None):
+        """用缓存的文字遮罩绘制文字，效果与 draw.text 相同；clip=(x0, y0, x1, y1) 时裁掉区域外的部分"""
+        mask, ox, oy = self._text_tile(text, font)
+        x, y = xy[0] - ox, xy[1] - oy
+        if clip is not None:
+            left, top = max(x, clip[0]), max(y, clip[1])
+            right, bottom = min(x + mask.width, clip[2]), min(y + mask.height, clip[3])
+            if right <= left or bottom <= top:
+                return
+            mask = mask.crop((left - x, top - y, right - x, bottom - y))
+            x, y = left, top
+        img.paste(color, (x, y, x + mask.width, y + mask.height), mask)
+    
+    @staticmethod
+    def _paint_frame(arr: np.ndarray, x: int, y: int, w: int, h: int):
+        """在画布上绘制3像素宽的容器轮廓（向内，包含右下边界）"""
+        frame = arr[y:y + h + 1, x:x + w + 1]
+        frame[:3] = frame[-3:] = frame[:, :3] = frame[:, -3:] = (100, 100, 100)
+    
+    @staticmethod
+    def _paint_rects(arr: np.ndarray, xs, ys, ws, hs, colors, owner: np.ndarray = None):
+        """按顺序在画布上填充货物矩形及1像素边框（与draw.rectangle一样包含右下边界）
+        owner 不为空时记录每个像素最终属于哪个矩形"""
+        outline = (50, 50, 50)
+        for i, (x, y, w, h, color) in enumerate(zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist(), colors)):
+            x0, y0 = max(x, 0), max(y, 0)
+            region = arr[y0:y + h + 1, x0:x + w + 1]
+            if region.size == 0:
+                continue
+            region[:] = color
+            region[0, :] = region[-1, :] = region[:, 0] = region[:, -1] = outline
+            if owner is not None:
+                owner[y0:y + h + 1, x0:x + w + 1] = i
+    
+    def _get_bg(self, kind: str, width: int, height: int, frame: tuple) -> np.ndarray:
+        """获取缓存的视图背景（底色和容器轮廓不随货物变化），frame 为容器轮廓 (x, y, w, h)
+        轮廓由容器尺寸换算而来，一并作为键，更换容器后自动重画"""
+        key = (kind, width, height, frame)
+        bg = self._bg_cache.get(key)
+        if bg is None:
+            bg = np.empty((height, width, 3), dtype=np.uint8)
+            bg[:] = (240, 240, 245)
+            self._paint_frame(bg, *frame)
+            self._bg_cache[key] = bg
+        return bg
+    
+    def _render_top(self, arr: np.ndarray) -> list:
+        """在 arr (H, W, 3) 上绘制俯视图的容器和货物，返回待绘制的文字 [(xy, text, font, color)]"""
+        height, width = arr.shape[:2]
+        scale = self.calculate_scale(width, height, self.container.length, self.container.width)
         
         # 绘制容器轮廓
         container_x = self.margin
         container_y = self.margin
-        container_w = int(self.container.length * self.scale)
-        container_h = int(self.container.width * self.scale)
-        
-        draw.rectangle([container_x, container_y, container_x + container_w, container_y + container_h],
-                      outline=(100, 100, 100), width=3)
+        container_w = int(self.container.length * scale)
+        container_h = int(self.container.width * scale)
+        np.copyto(arr, self._get_bg('top', width, height, (container_x, container_y, container_w, container_h)))
         
         # 绘制货物（按高度排序，底层的先画）
-        sorted_cargos = sorted(self.placed_cargos, key=lambda p: p.z)
-        
-        for placed in sorted_cargos:
-            x = container_x + int(placed.x * self.scale)
-            y = container_y + int(placed.y * self.scale)
-            w = int(placed.actual_length * self.scale)
-            h = int(placed.actual_width * self.scale)
-            
-            r, g, b = placed.cargo.color
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            
-            # 绘制货物矩形
-            draw.rectangle([x, y, x + w, y + h], fill=color, outline=(50, 50, 50), width=1)
-            
-            # 添加货物名称（如果空间足够）
-            if w > 40 and h > 20:
-                text = placed.cargo.name[:6]
-                draw.text((x + 3, y + 3), text, fill=(255, 255, 255), font=self.font)
+        # 直接在numpy数组上切片填充，避免逐个调用draw.rectangle
+        placed = self.placed_cargos
+        z_keys = np.fromiter((p.z for p in placed), dtype=np.float64, count=len(placed))
+        sorted_cargos = [placed[i] for i in np.argsort(z_keys, kind='stable').tolist()]
+        xs, ys, ws, hs, colors = self._build_rect_arrays(sorted_cargos, 'xy', container_x, container_y, scale)
+        if sorted_cargos:
+            owner = np.full((height, width), -1, dtype=np.int32)  # 记录每个像素最终属于哪个货物
+            self._paint_rects(arr, xs, ys, ws, hs, colors, owner)
+        
+        body_font = self._font_cache['body']
+        labels = []
+        
+        # 添加货物名称（如果空间足够），只标注未被上层货物遮住的货物
+        for i, (x, y, w, h) in enumerate(zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist())):
+            tx, ty = x + 3, y + 3
+            if w > 40 and h > 20 and 0 <= ty < height and 0 <= tx < width and owner[ty, tx] == i:
+                labels.append(((tx, ty), sorted_cargos[i].cargo.name[:6], body_font, (255, 255, 255)))
         
         # 添加标题
-        draw.text((10, 10), "俯视图 (Top View)", fill=(50, 50, 50), font=self.title_font)
+        labels.append(((10, 10), "俯视图 (Top View)", self._font_cache['title'], (50, 50, 50)))
         
         # 添加尺寸标注
-        draw.text((container_x, height - 30), f"长度: {self.container.length}cm", fill=(80, 80, 80), font=self.font)
-        draw.text((width - 180, container_y + container_h + 10), f"宽度: {self.container.width}cm", fill=(80, 80, 80), font=self.font)
-        
-        return img
-    
-    def generate_front_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
-        """生成正视图（X-Z平面，从前往后看）"""
-        if not PIL_SUPPORT:
-            return None
-        
-        self.scale = self.calculate_scale(width, height, self.container.length, self.container.height)
-        
-        img = Image.new('RGB', (width, height), color=(240, 240, 245))
-        draw = ImageDraw.Draw(img)
+        labels.append(((container_x, height - 30), f"长度: {self.container.length}cm", body_font, (80, 80, 80)))
+        labels.append(((width - 180, container_y + container_h + 10), f"宽度: {self.container.width}cm", body_font, (80, 80, 80)))
+        return labels
+    
+    def _render_elevation(self, arr: np.ndarray, axes: str) -> list:
+        """在 arr 上绘制正视图（axes='xz'）或侧视图（axes='yz'），返回待绘制的文字"""
+        height, width = arr.shape[:2]
+        if axes == 'xz':
+            horizontal, title = self.container.length, "正视图 (Front View)"
+            dim_label = f"长度: {self.container.length}cm"
+        else:
+            horizontal, title = self.container.width, "侧视图 (Side View)"
+            dim_label = f"宽度: {self.container.width}cm"
+        scale = self.calculate_scale(width, height, horizontal, self.container.height)
         
         # 绘制容器轮廓
         container_x = self.margin
-        container_y = height - self.margin - int(self.container.height * self.scale)
-        container_w = int(self.container.length * self.scale)
-        container_h = int(self.container.height * self.scale)
-        
-        draw.rectangle([container_x, container_y, container_x + container_w, container_y + container_h],
-                      outline=(100, 100, 100), width=3)
+        container_y = height - self.margin - int(self.container.height * scale)
+        container_w = int(horizontal * scale)
+        container_h = int(self.container.height * scale)
+        np.copyto(arr, self._get_bg(axes, width, height, (container_x, container_y, container_w, container_h)))
         
         # 绘制货物
-        for placed in self.placed_cargos:
-            x = container_x + int(placed.x * self.scale)
-            y = container_y + container_h - int((placed.z + placed.cargo.height) * self.scale)
-            w = int(placed.actual_length * self.scale)
-            h = int(placed.cargo.height * self.scale)
-            
-            r, g, b = placed.cargo.color
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            
-            draw.rectangle([x, y, x + w, y + h], fill=color, outline=(50, 50, 50), width=1)
+        if self.placed_cargos:
+            xs, ys, ws, hs, colors = self._build_rect_arrays(self.placed_cargos, axes, container_x, container_y + container_h, scale)
+            self._paint_rects(arr, xs, ys, ws, hs, colors)
         
         # 添加标题
-        draw.text((10, 10), "正视图 (Front View)", fill=(50, 50, 50), font=self.title_font)
-        draw.text((container_x, height - 30), f"长度: {self.container.length}cm", fill=(80, 80, 80), font=self.font)
-        draw.text((10, container_y - 25), f"高度: {self.container.height}cm", fill=(80, 80, 80), font=self.font)
+        return [
+            ((10, 10), title, self.title_font, (50, 50, 50)),
+            ((container_x, height - 30), dim_label, self.font, (80, 80, 80)),
+            ((10, container_y - 25), f"高度: {self.container.height}cm", self.font, (80, 80, 80)),
+        ]
+    
+    def _draw_labels(self, img: 'Image.Image', labels: list, offset: tuple = (0, 0), clip: tuple = None):
+        """绘制 _render_* 返回的文字，offset 为面板在 img 中的位置，clip 限制文字不越出面板"""
+        for (x, y), text, font, color in labels:
+            self._paste_text(img, (x + offset[0], y + offset[1]), text, font, color, clip)
+    
+    def generate_top_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
+        """生成俯视图（X-Y平面，从上往下看）"""
+        if not PIL_SUPPORT:
+            return None
+        
+        arr = np.empty((height, width, 3), dtype=np.uint8)
+        labels = self._render_top(arr)
+        img = Image.fromarray(arr)
+        self._draw_labels(img, labels)
+        return img
+    
+    def generate_front_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
+        """生成正视图（X-Z平面，从前往后看）"""
+        if not PIL_SUPPORT:
+            return None
         
+        arr = np.empty((height, width, 3), dtype=np.uint8)
+        labels = self._render_elevation(arr, 'xz')
+        img = Image.fromarray(arr)
+        self._draw_labels(img, labels)
         return img
     
     def generate_side_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
@@ -2240,37 +3141,10 @@ class LoadingImageGenerator:
         if not PIL_SUPPORT:
             return None
         
-        self.scale = self.calculate_scale(width, height, self.container.width, self.container.height)
-        
-        img = Image.new('RGB', (width, height), color=(240, 240, 245))
-        draw = ImageDraw.Draw(img)
-        
-        # 绘制容器轮廓
-        container_x = self.margin
-        container_y = height - self.margin - int(self.container.height * self.scale)
-        container_w = int(self.container.width * self.scale)
-        container_h = int(self.container.height * self.scale)
-        
-        draw.rectangle([container_x, container_y, container_x + container_w, container_y + container_h],
-                      outline=(100, 100, 100), width=3)
-        
-        # 绘制货物
-        for placed in self.placed_cargos:
-            x = container_x + int(placed.y * self.scale)
-            y = container_y + container_h - int((placed.z + placed.cargo.height) * self.scale)
-            w = int(placed.actual_width * self.scale)
-            h = int(placed.cargo.height * self.scale)
-            
-            r, g, b = placed.cargo.color
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            
-            draw.rectangle([x, y, x + w, y + h], fill=color, outline=(50, 50, 50), width=1)
-        
-        # 添加标题
-        draw.text((10, 10), "侧视图 (Side View)", fill=(50, 50, 50), font=self.title_font)
-        draw.text((container_x, height - 30), f"宽度: {self.container.width}cm", fill=(80, 80, 80), font=self.font)
-        draw.text((10, container_y - 25), f"高度: {self.container.height}cm", fill=(80, 80, 80), font=self.font)
-        
+        arr = np.empty((height, width, 3), dtype=np.uint8)
+        labels = self._render_elevation(arr, 'yz')
+        img = Image.fromarray(arr)
+        self._draw_labels(img, labels)
         return img
     
     def generate_isometric_view(self, width: int = 800, height: int = 600) -> Optional['Image.Image']:
@@ -2279,35 +3153,25 @@ class LoadingImageGenerator:
             return None
         
         # 如果有3D视图引用，使用OpenGL截图
-        if self.view_3d is not None:
+        # 没有货物时只有容器线框，直接用PIL绘制，省去离屏渲染和读回
+        if self.view_3d is not None and self.placed_cargos:
             try:
-                # 使用OpenGL截图
-                qimage = self.view_3d.capture_isometric_image(width, height)
-                
-                # 将QImage转换为PIL Image
-                qimage = qimage.convertToFormat(qimage.Format.Format_RGB888)
-                ptr = qimage.bits()
-                ptr.setsize(qimage.sizeInBytes())
+                # 使用OpenGL截图，直接读回FBO像素，不经QImage中转
+                data = self.view_3d.read_isometric_pixels(width, height)
                 
-                img = Image.frombytes('RGB', (qimage.width(), qimage.height()), bytes(ptr))
+                # glReadPixels 的行自下而上，倒序行即为正向图像；复制一份可写数组（唯一一次像素拷贝）
+                arr = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)[::-1].copy()
                 
-                # 添加标题和尺寸信息
-                draw = ImageDraw.Draw(img)
-                
-                # 绘制半透明背景
-                title_bg = Image.new('RGBA', (width, 40), (240, 240, 245, 220))
-                img_rgba = img.convert('RGBA')
-                img_rgba.paste(title_bg, (0, 0), title_bg)
-                
-                footer_bg = Image.new('RGBA', (width, 35), (240, 240, 245, 220))
-                img_rgba.paste(footer_bg, (0, height - 35), footer_bg)
-                
-                img = img_rgba.convert('RGB')
-                draw = ImageDraw.Draw(img)
+                # 在numpy数组上混合半透明标题栏/底栏背景
+                alpha = 220 / 255
+                bar_bg = np.array([240, 240, 245], dtype=np.float32) * alpha
+                arr[:40] = (arr[:40] * (1 - alpha) + bar_bg).astype(np.uint8)
+                arr[height - 35:] = (arr[height - 35:] * (1 - alpha) + bar_bg).astype(np.uint8)
+                img = Image.fromarray(arr)
                 
                 L, W, H = self.container.length, self.container.width, self.container.height
-                draw.text((10, 10), "等轴测视图 (Isometric View)", fill=(50, 50, 50), font=self.title_font)
-                draw.text((10, height - 30), f"尺寸: {L} × {W} × {H} cm", fill=(80, 80, 80), font=self.font)
+                self._paste_text(img, (10, 10), "等轴测视图 (Isometric View)", self.title_font, (50, 50, 50))
+                self._paste_text(img, (10, height - 30), f"尺寸: {L} × {W} × {H} cm", self.font, (80, 80, 80))
                 
                 return img
             except Exception as e:
@@ -2353,11 +3217,13 @@ class LoadingImageGenerator:
         cx = width / 2 - (min_px + max_px) / 2 * scale
         cy = height / 2 - (min_py + max_py) / 2 * scale
         
+        # 循环不变量提到外面，投影时每个点只需两次乘法
+        cxs = cos_a * scale
+        sxs = sin_a * scale
+        
         def project(x, y, z):
             """等轴测投影"""
-            px = (x - y) * cos_a * scale + cx
-            py = -(x + y) * sin_a * scale - z * scale + cy
-            return int(px), int(py)
+            return int((x - y) * cxs + cx), int(-(x + y) * sxs - z * scale + cy)
         
         # 绘制容器边框（线框）
         container_color = (100, 100, 110)
@@ -2367,20 +3233,14 @@ class LoadingImageGenerator:
         p1 = project(L, 0, 0)
         p2 = project(L, W, 0)
         p3 = project(0, W, 0)
-        draw.line([p0, p1], fill=container_color, width=2)
-        draw.line([p1, p2], fill=container_color, width=2)
-        draw.line([p2, p3], fill=container_color, width=2)
-        draw.line([p3, p0], fill=container_color, width=2)
+        draw.line([p0, p1, p2, p3, p0], fill=container_color, width=2)
         
         # 顶面
         p4 = project(0, 0, H)
         p5 = project(L, 0, H)
         p6 = project(L, W, H)
         p7 = project(0, W, H)
-        draw.line([p4, p5], fill=container_color, width=2)
-        draw.line([p5, p6], fill=container_color, width=2)
-        draw.line([p6, p7], fill=container_color, width=2)
-        draw.line([p7, p4], fill=container_color, width=2)
+        draw.line([p4, p5, p6, p7, p4], fill=container_color, width=2)
         
         # 竖直边
         draw.line([p0, p4], fill=container_color, width=2)
@@ -2391,45 +3251,33 @@ class LoadingImageGenerator:
         # 绘制货物（按深度排序 - painter's algorithm）
         # 等轴测视角从右前上方看，需要先画左后下的货物
         # 排序依据：x小、y小的在后面先画；同位置时z小的先画
-        sorted_cargos = sorted(self.placed_cargos, 
-                               key=lambda p: (p.x + p.y + p.z * 0.5))
-        
-        for placed in sorted_cargos:
-            x, y, z = placed.x, placed.y, placed.z
-            l = placed.actual_length
-            w = placed.actual_width
-            h = placed.cargo.height
-            
-            r, g, b = placed.cargo.color
-            color = (int(r * 255), int(g * 255), int(b * 255))
-            darker = (int(r * 200), int(g * 200), int(b * 200))
-            darkest = (int(r * 160), int(g * 160), int(b * 160))
-            
-            # 货物的8个顶点
-            # 底面四点
-            v0 = project(x, y, z)          # 左后下
-            v1 = project(x + l, y, z)      # 右后下
-            v2 = project(x + l, y + w, z)  # 右前下
-            v3 = project(x, y + w, z)      # 左前下
-            # 顶面四点
-            v4 = project(x, y, z + h)          # 左后上
-            v5 = project(x + l, y, z + h)      # 右后上
-            v6 = project(x + l, y + w, z + h)  # 右前上
-            v7 = project(x, y + w, z + h)      # 左前上
-            
+        n = len(self.placed_cargos)
+        data = np.array([(p.x, p.y, p.z, p.actual_length, p.actual_width, p.cargo.height)
+                         for p in self.placed_cargos], dtype=np.float64).reshape(n, 6)
+        
+        # 一次性投影所有货物的8个顶点 -> (N, 8, 2)，并按深度排序
+        verts, depth = _project_cargos(data, cos_a, sin_a, scale, cx, cy)
+        order = np.argsort(depth, kind='stable')
+        
+        edge = (30, 30, 30)
+        for i in order.tolist():
+            v = verts[i].tolist()
+            # 三个可见面的颜色: 顶面(原色)、右面(较暗)、前面(最暗)
+            cargo = self.placed_cargos[i].cargo
+            color, darker, darkest = cargo.color_u8, cargo.color_u8_80, cargo.color_u8_64
             # 从右前上方看，可见三个面：顶面、右面(x=x+l)、前面(y=y+w)
             # 按painter算法，先画被遮挡的面
             
             # 右面 (x = x+l 那一面) - 中等亮度
-            draw.polygon([v1, v2, v6, v5], fill=darker, outline=(30, 30, 30))
+            draw.polygon([tuple(v[1]), tuple(v[2]), tuple(v[6]), tuple(v[5])], fill=darker, outline=edge)
             # 前面 (y = y+w 那一面) - 最暗
-            draw.polygon([v3, v2, v6, v7], fill=darkest, outline=(30, 30, 30))
+            draw.polygon([tuple(v[3]), tuple(v[2]), tuple(v[6]), tuple(v[7])], fill=darkest, outline=edge)
             # 顶面 (z = z+h 那一面) - 最亮，最后画
-            draw.polygon([v4, v5, v6, v7], fill=color, outline=(30, 30, 30))
+            draw.polygon([tuple(v[4]), tuple(v[5]), tuple(v[6]), tuple(v[7])], fill=color, outline=edge)
         
         # 添加标题
-        draw.text((10, 10), "等轴测视图 (Isometric View)", fill=(50, 50, 50), font=self.title_font)
-        draw.text((10, height - 30), f"尺寸: {L} × {W} × {H} cm", fill=(80, 80, 80), font=self.font)
+        self._paste_text(img, (10, 10), "等轴测视图 (Isometric View)", self.title_font, (50, 50, 50))
+        self._paste_text(img, (10, height - 30), f"尺寸: {L} × {W} × {H} cm", self.font, (80, 80, 80))
         
         return img
     
@@ -2442,23 +3290,26 @@ class LoadingImageGenerator:
         sub_width = width // 2 - 20
         sub_height = height // 2 - 20
         
-        combined = Image.new('RGB', (width, height), color=(255, 255, 255))
-        
-        # 生成四个视图
-        top_view = self.generate_top_view(sub_width, sub_height)
-        front_view = self.generate_front_view(sub_width, sub_height)
-        side_view = self.generate_side_view(sub_width, sub_height)
-        iso_view = self.generate_isometric_view(sub_width, sub_height)
-        
-        # 拼接
-        if top_view:
-            combined.paste(top_view, (10, 10))
-        if front_view:
-            combined.paste(front_view, (sub_width + 20, 10))
-        if side_view:
-            combined.paste(side_view, (10, sub_height + 20))
+        # 四个面板直接画在同一块画布上：左上俯视、右上正视、左下侧视、右下等轴测
+        canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+        panels = [(10, 10), (sub_width + 20, 10), (10, sub_height + 20), (sub_width + 20, sub_height + 20)]
+        regions = [canvas[y:y + sub_height, x:x + sub_width] for x, y in panels]
+        
+        # 三个正交视图为纯numpy绘制，各自写入不相交的面板，放到线程池并行；
+        # 等轴测视图可能使用OpenGL截图（上下文绑定主线程），留在当前线程
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            fut_top = executor.submit(self._render_top, regions[0])
+            fut_front = executor.submit(self._render_elevation, regions[1], 'xz')
+            fut_side = executor.submit(self._render_elevation, regions[2], 'yz')
+            iso_view = self.generate_isometric_view(sub_width, sub_height)
+            panel_labels = [fut_top.result(), fut_front.result(), fut_side.result()]
+        
         if iso_view:
-            combined.paste(iso_view, (sub_width + 20, sub_height + 20))
+            np.copyto(regions[3], np.asarray(iso_view))
+        
+        combined = Image.fromarray(canvas)
+        for (x, y), labels in zip(panels, panel_labels):
+            self._draw_labels(combined, labels, (x, y), (x, y, x + sub_width, y + sub_height))
         
         return combined
     
@@ -2467,37 +3318,39 @@ class LoadingImageGenerator:
         if not PIL_SUPPORT:
             return None
         
-        img = Image.new('RGB', (width, height), color=(255, 255, 255))
-        draw = ImageDraw.Draw(img)
+        canvas = np.full((height, width, 3), 255, dtype=np.uint8)
         
         # 左侧放等轴测视图
         iso_width = width * 2 // 3 - 20
         iso_height = height - 40
         iso_view = self.generate_isometric_view(iso_width, iso_height)
         if iso_view:
-            img.paste(iso_view, (10, 20))
+            np.copyto(canvas[20:20 + iso_height, 10:10 + iso_width], np.asarray(iso_view))
         
         # 右侧放统计信息
         stats_x = iso_width + 30
         stats_y = 30
         stats_w = width - stats_x - 20
         
-        # 绘制统计信息背景
-        draw.rectangle([stats_x, stats_y, width - 20, height - 20],
-                      fill=(248, 248, 250), outline=(200, 200, 210), width=2)
+        # 绘制统计信息背景（切片填充，2像素边框，包含右下边界）
+        box = canvas[stats_y:height - 19, stats_x:width - 19]
+        box[:] = (248, 248, 250)
+        box[:2] = box[-2:] = box[:, :2] = box[:, -2:] = (200, 200, 210)
         
         # 标题
         y_offset = stats_y + 20
-        draw.text((stats_x + 15, y_offset), "装载统计", fill=(50, 50, 50), font=self.title_font)
+        title_y = y_offset
         y_offset += 40
         
         # 分隔线
-        draw.line([(stats_x + 10, y_offset), (width - 30, y_offset)], fill=(200, 200, 210), width=1)
+        canvas[y_offset, stats_x + 10:width - 29] = (200, 200, 210)
         y_offset += 15
         
+        img = Image.fromarray(canvas)
+        self._paste_text(img, (stats_x + 15, title_y), "装载统计", self.title_font, (50, 50, 50))
+        
         # 统计数据
-        total_volume = sum(p.cargo.volume for p in self.placed_cargos)
-        total_weight = sum(p.cargo.weight for p in self.placed_cargos)
+        total_volume, total_weight = PlacedCargo.totals(self.placed_cargos)
         vol_util = (total_volume / self.container.volume) * 100 if self.container.volume > 0 else 0
         wt_util = (total_weight / self.container.max_weight) * 100 if self.container.max_weight > 0 else 0
         
@@ -2514,10 +3367,11 @@ class LoadingImageGenerator:
             ("载重利用率", f"{wt_util:.1f}%"),
         ]
         
+        body_font = self._font_cache['body']
         for label, value in stats_items:
             if label:
-                draw.text((stats_x + 15, y_offset), f"{label}:", fill=(100, 100, 100), font=self.font)
-                draw.text((stats_x + 100, y_offset), str(value), fill=(50, 50, 50), font=self.font)
+                self._paste_text(img, (stats_x + 15, y_offset), f"{label}:", body_font, (100, 100, 100))
+                self._paste_text(img, (stats_x + 100, y_offset), str(value), body_font, (50, 50, 50))
             y_offset += 28
         
         return img
@@ -2534,20 +3388,203 @@ class LoadingImageGenerator:
             ('combined', self.generate_combined_view),
             ('summary', self.generate_summary_image),
         ]
-        
-        for name, generator in views:
-            img = generator()
-            if img:
-                file_path = f"{base_path}_{name}.png"
-                img.save(file_path)
+        if not self.placed_cargos:
+            # 空容器只输出俯视预览图，其余视图没有信息量
+            views = views[:1]
+        
+        # 视图依次生成（等轴测图需要在主线程使用OpenGL），PNG编码放到线程池中与下一张视图的生成重叠
+        with ThreadPoolExecutor(max_workers=min(len(views), os.cpu_count() or 1)) as executor:
+            futures = []
+            for name, generator in views:
+                img = generator()
+                if img:
+                    file_path = f"{base_path}_{name}.png"
+                    futures.append((file_path, executor.submit(img.save, file_path, optimize=False, compress_level=1)))
+            
+            for file_path, future in futures:
+                future.result()
                 saved_files.append(file_path)
         
         return saved_files
 
 
+@lru_cache(maxsize=None)
+def _pdf_paragraph_styles() -> Tuple['ParagraphStyle', 'ParagraphStyle', 'ParagraphStyle']:
+    """PDF导出共用的中文标题、小节标题、正文段落样式 (title, heading, normal)
+    首次导出时构建一次，之后各次导出复用，不再每次 getSampleStyleSheet()"""
+    from reportlab.lib.enums import TA_CENTER
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('ChineseTitle', parent=styles['Title'],
+                                 fontName='ChineseFont', fontSize=24, alignment=TA_CENTER, spaceAfter=30)
+    heading_style = ParagraphStyle('ChineseHeading', parent=styles['Heading2'],
+                                   fontName='ChineseFont', fontSize=14,
+                                   textColor=colors.HexColor('#2c5282'), spaceBefore=15, spaceAfter=10)
+    normal_style = ParagraphStyle('ChineseNormal', parent=styles['Normal'],
+                                  fontName='ChineseFont', fontSize=10, leading=14)
+    return title_style, heading_style, normal_style
+
+
+@lru_cache(maxsize=None)
+def _pdf_table_styles() -> Dict[str, 'TableStyle']:
+    """PDF导出各表格的样式，按表格名索引；首次导出时构建一次，之后各次导出和同类表格共用"""
+    return {
+        # 多集装箱PDF：总体统计
+        'summary': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('PADDING', (0, 0), (-1, -1), 8),
+        ]),
+        # 多集装箱PDF：每个集装箱的信息表
+        'container_info': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#38a169')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('PADDING', (0, 0), (-1, -1), 6),
+        ]),
+        # 多集装箱PDF：每个集装箱的货物明细
+        'container_cargo': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#805ad5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
+            ('PADDING', (0, 0), (-1, -1), 5),
+        ]),
+        # 单集装箱PDF：容器信息
+        'container': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f7fafc')),
+            ('PADDING', (0, 0), (-1, -1), 8),
+        ]),
+        # 单集装箱PDF：装载统计
+        'stats': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#38a169')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f0fff4')),
+            ('PADDING', (0, 0), (-1, -1), 8),
+        ]),
+        # 单集装箱PDF：重心分析
+        'cog': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3182ce')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#ebf8ff')),
+            ('PADDING', (0, 0), (-1, -1), 8),
+        ]),
+        # 单集装箱PDF：装载明细
+        'loading': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#805ad5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
+            ('PADDING', (0, 0), (-1, -1), 5),
+        ]),
+        # 单集装箱PDF：组托内容（每个托盘一张）
+        'pallet': TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ed8936')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#fed7aa')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fffaf0')]),
+            ('PADDING', (0, 0), (-1, -1), 4),
+        ]),
+    }
+
+
 class ContainerLoadingApp(QMainWindow):
     """主窗口"""
     
+    # 选中货物信息面板
+    _SELECTED_CARGO_QSS = """
+        CollapsibleGroupBox {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #3d5a80, stop:1 #2c3e50);
+            border: 1px solid #4a90d9;
+            border-radius: 6px;
+            margin-top: 8px;
+            font-weight: bold;
+            color: #81D4FA;
+        }
+        CollapsibleGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+        }
+        QLabel {
+            color: #E0E0E0;
+            font-size: 11px;
+        }
+        QLabel#securing {
+            color: #FFD54F;
+        }
+    """
+    
+    # 装箱步骤表格
+    _STEPS_TABLE_QSS = """
+        QTableView {
+            alternate-background-color: #2a3441;
+            gridline-color: #3d4f5f;
+        }
+        QTableView::item {
+            padding: 4px;
+        }
+        QHeaderView::section {
+            background-color: #3d5a80;
+            color: white;
+            padding: 5px;
+            border: none;
+            font-weight: bold;
+        }
+    """
+    
+    # 拖拽调整按钮：开启
+    _DRAG_MODE_ON_QSS = """
+        QPushButton {
+            background-color: #FF9800;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: bold;
+        }
+    """
+    
+    # 拖拽调整按钮：关闭
+    _DRAG_MODE_OFF_QSS = """
+        QPushButton {
+            background-color: #37474F;
+            color: white;
+            border: 1px solid #546E7A;
+            border-radius: 6px;
+            padding: 8px 16px;
+        }
+    """
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("集装箱配载软件 v0.6 - by Henry Xue")
@@ -2568,6 +3605,15 @@ class ContainerLoadingApp(QMainWindow):
         self.container_results: List[ContainerLoadingResult] = []
         self.container_count = 1
         
+        self._gl_update_pending = False  # 已排队的3D视图刷新，合并同一轮事件循环内的多次请求
+        self._excel_import_task: Optional['ExcelImportTask'] = None  # 正在后台解析的Excel导入
+        self._excel_import_progress: Optional[QProgressDialog] = None  # 解析期间的模态等待框，阻止编辑货物和配载
+        self._option_icons: Dict[str, QIcon] = {}  # 货物表格选项列的预渲染图标，按选项文本缓存
+        # 多集装箱配载按数量展开的单件货物，货物清单未变时复用，见 _expand_cargos
+        self._expanded_cargos: Optional[Tuple[tuple, List[Cargo]]] = None
+        # PDF导出用等轴测视图的PNG字节，按布局指纹缓存，见 _isometric_png
+        self._iso_png_cache: Dict[tuple, bytes] = {}
+        
         self.setup_style()
         self.setup_ui()
         self.setup_default_container()
@@ -2619,19 +3665,19 @@ class ContainerLoadingApp(QMainWindow):
                 border-top: 6px solid #9e9e9e;
                 margin-right: 10px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #252525;
                 border: 1px solid #3d3d3d;
                 border-radius: 6px;
                 gridline-color: #3d3d3d;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 4px 2px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #2196F3;
             }
-            QTableWidget QLineEdit {
+            QTableView QLineEdit {
                 background-color: #1e1e1e;
                 color: #ffffff;
                 border: 1px solid #2196F3;
@@ -2687,7 +3733,7 @@ class ContainerLoadingApp(QMainWindow):
             QScrollBar::handle:vertical:hover {
                 background-color: #4d4d4d;
             }
-        """)
+        """ + ModernButton.STYLE_SHEET)
     
     def setup_ui(self):
         """设置界面"""
@@ -2849,6 +3895,7 @@ class ContainerLoadingApp(QMainWindow):
         self.cargo_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.cargo_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
         self.cargo_table.setAlternatingRowColors(True)
+        self.cargo_table.setIconSize(QSize(48, 16))  # 选项列图标（见 _option_icon）
         self.cargo_table.setMinimumHeight(180)
         # 连接单元格编辑信号
         self.cargo_table.cellChanged.connect(self.on_cargo_table_cell_changed)
@@ -2998,6 +4045,8 @@ class ContainerLoadingApp(QMainWindow):
         view_group = QGroupBox("🎮 3D配载视图 (左键旋转 | 滚轮缩放 | 右键平移)")
         view_layout = QVBoxLayout(view_group)
         
+        # 仍使用 QOpenGLWidget 直接嵌入布局：拖拽、截图导出、全屏/托盘预览窗口都依赖它的 QWidget 接口。
+        # 兄弟控件刷新只会触发合成而不会调用 paintGL，且场景未变时 paintGL 直接复制缓存帧
         self.gl_widget = Container3DView()
         # 设置拖拽回调
         self.gl_widget.on_cargo_selected = self.on_cargo_drag_selected
@@ -3011,11 +4060,15 @@ class ContainerLoadingApp(QMainWindow):
         
         views = [("正视", "front"), ("后视", "back"), ("左视", "left"), 
                  ("右视", "right"), ("俯视", "top"), ("等轴", "iso")]
+        # 视角预设存放在按钮属性上，整组共用一个点击处理
+        self.view_button_group = QButtonGroup(self)
         for name, preset in views:
             btn = ModernButton(name)
             btn.setFixedWidth(60)
-            btn.clicked.connect(lambda checked, p=preset: self.gl_widget.set_view(p))
+            btn.setProperty("preset", preset)
+            self.view_button_group.addButton(btn)
             view_btn_layout.addWidget(btn)
+        self.view_button_group.buttonClicked.connect(self.on_view_button_clicked)
         
         view_btn_layout.addStretch()
         
@@ -3200,22 +4253,7 @@ class ContainerLoadingApp(QMainWindow):
         
         # 选中货物信息面板 - 可折叠，默认展开
         self.selected_cargo_group = CollapsibleGroupBox("📦 选中货物信息", collapsed=False)
-        self.selected_cargo_group.setStyleSheet("""
-            CollapsibleGroupBox {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #3d5a80, stop:1 #2c3e50);
-                border: 1px solid #4a90d9;
-                border-radius: 6px;
-                margin-top: 8px;
-                font-weight: bold;
-                color: #81D4FA;
-            }
-            CollapsibleGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
+        self.selected_cargo_group.setStyleSheet(self._SELECTED_CARGO_QSS)
         selected_cargo_layout = QHBoxLayout(self.selected_cargo_group)
         
         # 左侧：基本信息
@@ -3227,7 +4265,6 @@ class ContainerLoadingApp(QMainWindow):
         
         for label in [self.cargo_name_label, self.cargo_size_label, 
                       self.cargo_weight_label, self.cargo_stackable_label]:
-            label.setStyleSheet("color: #E0E0E0; font-size: 11px;")
             left_info.addWidget(label)
         selected_cargo_layout.addLayout(left_info)
         
@@ -3240,7 +4277,6 @@ class ContainerLoadingApp(QMainWindow):
         
         for label in [self.cargo_pos_label, self.cargo_rotation_label,
                       self.cargo_layer_label, self.cargo_volume_label]:
-            label.setStyleSheet("color: #E0E0E0; font-size: 11px;")
             mid_info.addWidget(label)
         selected_cargo_layout.addLayout(mid_info)
         
@@ -3248,7 +4284,7 @@ class ContainerLoadingApp(QMainWindow):
         right_info = QVBoxLayout()
         self.cargo_securing_label = QLabel("加固建议: -")
         self.cargo_securing_label.setWordWrap(True)
-        self.cargo_securing_label.setStyleSheet("color: #FFD54F; font-size: 11px;")
+        self.cargo_securing_label.setObjectName("securing")
         right_info.addWidget(self.cargo_securing_label)
         
         # 查看托盘详情按钮（初始隐藏）
@@ -3332,9 +4368,10 @@ class ContainerLoadingApp(QMainWindow):
         steps_group = CollapsibleGroupBox("📝 装箱步骤", collapsed=False)
         steps_layout = QVBoxLayout(steps_group)
         
-        self.steps_table = QTableWidget()
-        self.steps_table.setColumnCount(6)
-        self.steps_table.setHorizontalHeaderLabels(["序号", "集装箱", "货物名称", "尺寸(cm)", "位置坐标", "加固"])
+        # 步骤数可能上千，用模型/视图按需生成单元格文本，不为每格创建 QTableWidgetItem
+        self.steps_model = LoadingStepsModel(self)
+        self.steps_table = QTableView()
+        self.steps_table.setModel(self.steps_model)
         
         # 设置列宽比例
         header = self.steps_table.horizontalHeader()
@@ -3351,24 +4388,11 @@ class ContainerLoadingApp(QMainWindow):
         self.steps_table.setColumnWidth(4, 130)  # 位置坐标
         self.steps_table.setColumnWidth(5, 80)   # 加固
         
+        # 行高固定，上千行时视图不必逐行计算行高
+        self.steps_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.steps_table.setMaximumHeight(180)
         self.steps_table.setAlternatingRowColors(True)
-        self.steps_table.setStyleSheet("""
-            QTableWidget {
-                alternate-background-color: #2a3441;
-                gridline-color: #3d4f5f;
-            }
-            QTableWidget::item {
-                padding: 4px;
-            }
-            QHeaderView::section {
-                background-color: #3d5a80;
-                color: white;
-                padding: 5px;
-                border: none;
-                font-weight: bold;
-            }
-        """)
+        self.steps_table.setStyleSheet(self._STEPS_TABLE_QSS)
         steps_layout.addWidget(self.steps_table)
         
         right_layout.addWidget(steps_group)
@@ -3379,22 +4403,33 @@ class ContainerLoadingApp(QMainWindow):
     
     def setup_rules_table(self):
         """设置规则表格"""
-        self.rules_list.setRowCount(len(self.loading_rules))
-        for i, rule in enumerate(self.loading_rules):
-            # 启用复选框
-            cb = QCheckBox()
-            cb.setChecked(rule.enabled)
-            cb.stateChanged.connect(lambda state, r=rule: setattr(r, 'enabled', state == 2))
-            self.rules_list.setCellWidget(i, 0, cb)
-            
-            # 规则名称
-            name_item = QTableWidgetItem(rule.name)
-            name_item.setToolTip(rule.description)
-            self.rules_list.setItem(i, 1, name_item)
-            
-            # 优先级
-            priority_item = QTableWidgetItem(str(rule.priority))
-            self.rules_list.setItem(i, 2, priority_item)
+        # 批量填充期间暂停重绘和信号，填完后统一刷新一次
+        self.rules_list.setUpdatesEnabled(False)
+        self.rules_list.blockSignals(True)
+        try:
+            self.rules_list.setRowCount(len(self.loading_rules))
+            for i, rule in enumerate(self.loading_rules):
+                # 启用复选框
+                cb = QCheckBox()
+                cb.setChecked(rule.enabled)
+                cb.stateChanged.connect(partial(self._toggle_rule, rule))
+                self.rules_list.setCellWidget(i, 0, cb)
+                
+                # 规则名称
+                name_item = QTableWidgetItem(rule.name)
+                name_item.setToolTip(rule.description)
+                self.rules_list.setItem(i, 1, name_item)
+                
+                # 优先级
+                priority_item = QTableWidgetItem(str(rule.priority))
+                self.rules_list.setItem(i, 2, priority_item)
+        finally:
+            self.rules_list.blockSignals(False)
+            self.rules_list.setUpdatesEnabled(True)
+    
+    def _toggle_rule(self, rule: LoadingRule, state: int):
+        """规则复选框状态变化"""
+        rule.enabled = (state == 2)
     
     def on_category_changed(self, category):
         """容器类别变化"""
@@ -3498,7 +4533,7 @@ class ContainerLoadingApp(QMainWindow):
             
             self.gl_widget.container = self.container
             self.gl_widget.placed_cargos = self.placed_cargos
-            self.gl_widget.update()
+            self._request_gl_update()
     
     def get_next_color(self):
         """获取下一个颜色"""
@@ -3528,68 +4563,83 @@ class ContainerLoadingApp(QMainWindow):
     
     def update_cargo_table(self):
         """更新货物表格"""
-        # 暂时阻止信号，避免触发 cellChanged
+        # 货物清单已变更，作废展开缓存
+        self._expanded_cargos = None
+        # 暂时阻止信号，避免触发 cellChanged；同时暂停重绘，填完后统一刷新一次
         self.cargo_table.blockSignals(True)
+        self.cargo_table.setUpdatesEnabled(False)
+        pallet_bg = QColor(255, 243, 224)  # 托盘行的浅橙色背景
         
-        self.cargo_table.setRowCount(len(self.cargos))
-        for i, cargo in enumerate(self.cargos):
-            # 名称列 - 如果是托盘，添加标记
-            name_text = cargo.name
-            if cargo.is_pallet:
-                name_text = f"📦 {cargo.name}"
-            name_item = QTableWidgetItem(name_text)
-            if cargo.is_pallet:
-                name_item.setBackground(QColor(255, 243, 224))  # 浅橙色背景
-            self.cargo_table.setItem(i, 0, name_item)
-            
-            # 尺寸显示为整数，更紧凑
-            size_item = QTableWidgetItem(f"{int(cargo.length)}×{int(cargo.width)}×{int(cargo.height)}")
-            if cargo.is_pallet:
-                size_item.setBackground(QColor(255, 243, 224))
-            self.cargo_table.setItem(i, 1, size_item)
-            
-            weight_item = QTableWidgetItem(f"{cargo.weight}kg")
-            if cargo.is_pallet:
-                weight_item.setBackground(QColor(255, 243, 224))
-            self.cargo_table.setItem(i, 2, weight_item)
-            
-            qty_item = QTableWidgetItem(str(cargo.quantity))
-            if cargo.is_pallet:
-                qty_item.setBackground(QColor(255, 243, 224))
-            self.cargo_table.setItem(i, 3, qty_item)
-            
-            # 选项列 - 显示图标表示各种属性
-            options = []
-            if cargo.is_pallet:
-                options.append(f"[{len(cargo.pallet_contents)}件]")  # 托盘内货物数
-            if cargo.allow_rotate:
-                options.append("🔄")  # 可旋转
-            if cargo.bottom_only:
-                options.append("⬇")  # 仅底层
-            if cargo.priority > 0:
-                options.append(f"P{cargo.priority}")  # 优先级
-            if cargo.group_id:
-                options.append(f"{cargo.group_id}")  # 分组
-            options_item = QTableWidgetItem("".join(options))
-            if cargo.is_pallet:
-                options_item.setBackground(QColor(255, 243, 224))
-            self.cargo_table.setItem(i, 4, options_item)
-
-            # 新增一列：组托托盘编号
-            pallet_info = ""
-            if hasattr(cargo, "pallet_no") and cargo.pallet_no:
-                pallet_info = f"托盘{cargo.pallet_no}"
-            elif hasattr(cargo, "pallet_of") and cargo.pallet_of:
-                pallet_info = f"托盘{cargo.pallet_of}"
-            pallet_item = QTableWidgetItem(pallet_info)
-            self.cargo_table.setItem(i, 5, pallet_item)
-
-            # 体积列（后移一列）
-            volume_item = QTableWidgetItem(f"{cargo.total_volume/1000000:.2f}")
-            self.cargo_table.setItem(i, 6, volume_item)
-        
-        # 恢复信号
-        self.cargo_table.blockSignals(False)
+        try:
+            self.cargo_table.setRowCount(len(self.cargos))
+            for i, cargo in enumerate(self.cargos):
+                # 名称列 - 如果是托盘，添加标记
+                name_text = cargo.name
+                if cargo.is_pallet:
+                    name_text = f"📦 {cargo.name}"
+                
+                # 选项列 - 显示图标表示各种属性
+                options = []
+                if cargo.is_pallet:
+                    options.append(f"[{len(cargo.pallet_contents)}件]")  # 托盘内货物数
+                if cargo.allow_rotate:
+                    options.append("🔄")  # 可旋转
+                if cargo.bottom_only:
+                    options.append("⬇")  # 仅底层
+                if cargo.priority > 0:
+                    options.append(f"P{cargo.priority}")  # 优先级
+                if cargo.group_id:
+                    options.append(f"{cargo.group_id}")  # 分组
+                
+                # 组托托盘编号
+                pallet_info = ""
+                if hasattr(cargo, "pallet_no") and cargo.pallet_no:
+                    pallet_info = f"托盘{cargo.pallet_no}"
+                elif hasattr(cargo, "pallet_of") and cargo.pallet_of:
+                    pallet_info = f"托盘{cargo.pallet_of}"
+                
+                # 名称、尺寸（整数，更紧凑）、重量、数量、选项、托盘编号、体积
+                items = [QTableWidgetItem(text) for text in (
+                    name_text,
+                    f"{int(cargo.length)}×{int(cargo.width)}×{int(cargo.height)}",
+                    f"{cargo.weight}kg",
+                    str(cargo.quantity),
+                    "",
+                    pallet_info,
+                    f"{cargo.total_volume/1000000:.2f}",
+                )]
+                # 选项列用预渲染图标显示，滚动重绘时只需贴图
+                option_text = "".join(options)
+                if option_text:
+                    items[4].setIcon(self._option_icon(option_text))
+                    items[4].setToolTip(option_text)
+                if cargo.is_pallet:
+                    for item in items[:5]:
+                        item.setBackground(pallet_bg)
+                for col, item in enumerate(items):
+                    self.cargo_table.setItem(i, col, item)
+        finally:
+            # 恢复信号和重绘
+            self.cargo_table.setUpdatesEnabled(True)
+            self.cargo_table.blockSignals(False)
+    
+    def _option_icon(self, text: str) -> QIcon:
+        """把选项列文本（🔄/⬇/P#/分组等）绘制成图标，同样的选项组合只绘制一次"""
+        icon = self._option_icons.get(text)
+        if icon is None:
+            size = self.cargo_table.iconSize()
+            ratio = self.cargo_table.devicePixelRatioF()
+            pixmap = QPixmap(int(size.width() * ratio), int(size.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.cargo_table.font())
+            painter.setPen(self.cargo_table.palette().color(QPalette.ColorRole.Text))
+            painter.drawText(0, 0, size.width(), size.height(),
+                             int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), text)
+            painter.end()
+            icon = self._option_icons[text] = QIcon(pixmap)
+        return icon
     
     def on_cargo_table_cell_changed(self, row: int, column: int):
         """处理货物表格单元格编辑"""
@@ -3601,6 +4651,8 @@ class ContainerLoadingApp(QMainWindow):
         if not item:
             return
         
+        self._expanded_cargos = None
+        
         text = item.text().strip()
         
         try:
@@ -3621,12 +4673,19 @@ class ContainerLoadingApp(QMainWindow):
                     self.cargo_table.blockSignals(False)
                 else:
                     # 恢复原值
-                    self.cargo_table.blockSignals(True)
-                    self.cargo_table.setItem(row, 3, QTableWidgetItem(str(cargo.quantity)))
-                    self.cargo_table.blockSignals(False)
+                    self._restore_cargo_cell(item, cargo, column)
         except ValueError:
-            # 输入无效，恢复原值
-            self.update_cargo_table()
+            # 输入无效，只恢复该单元格
+            self._restore_cargo_cell(item, cargo, column)
+    
+    def _restore_cargo_cell(self, item: QTableWidgetItem, cargo: Cargo, column: int):
+        """把编辑失败的单元格恢复为货物当前值（解析失败时货物对象未被修改）"""
+        text = {2: f"{cargo.weight}kg", 3: str(cargo.quantity)}.get(column)
+        if text is None:
+            return
+        self.cargo_table.blockSignals(True)
+        item.setText(text)
+        self.cargo_table.blockSignals(False)
     
     def delete_cargo(self):
         """删除选中货物"""
@@ -3646,6 +4705,9 @@ class ContainerLoadingApp(QMainWindow):
     
     def import_cargos(self):
         """导入货物"""
+        if self._excel_import_task is not None:
+            QMessageBox.information(self, "提示", "正在导入Excel，请稍候")
+            return
         file_filter = "Excel文件 (*.xlsx);;JSON文件 (*.json)" if EXCEL_SUPPORT else "JSON文件 (*.json)"
         filename, selected_filter = QFileDialog.getOpenFileName(
             self, "导入货物", "", file_filter)
@@ -3689,67 +4751,48 @@ class ContainerLoadingApp(QMainWindow):
                 QMessageBox.critical(self, "错误", f"导入失败: {e}")
     
     def import_from_excel(self, filename):
-        """从Excel导入货物"""
-        wb = load_workbook(filename)
-        ws = wb.active
-        
-        self.cargos = []
-        self.cargo_groups = []
-        self.color_index = 0
-        group_map = {}  # 记录分组ID到货物ID的映射
-        
-        # 跳过标题行，从第2行开始读取
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0] is None:  # 空行跳过
-                continue
-            
-            name = str(row[0]) if row[0] else f"货物{len(self.cargos)+1}"
-            length = float(row[1]) if row[1] else 100
-            width = float(row[2]) if row[2] else 80
-            height = float(row[3]) if row[3] else 60
-            weight = float(row[4]) if row[4] else 50
-            quantity = int(row[5]) if row[5] else 1
-            stackable = True
-            if len(row) > 6 and row[6] is not None:
-                stackable = str(row[6]).lower() in ('true', '是', '1', 'yes')
-            
-            # 读取分组信息 (第11列，索引10)
-            group_id = None
-            if len(row) > 10 and row[10]:
-                group_id = str(row[10]).strip()
-            
-            cargo = Cargo(
-                name=name,
-                length=length,
-                width=width,
-                height=height,
-                weight=weight,
-                quantity=quantity,
-                stackable=stackable,
-                group_id=group_id,
-                color=self.get_next_color()
-            )
-            self.cargos.append(cargo)
-            
-            # 记录分组
-            if group_id:
-                if group_id not in group_map:
-                    group_map[group_id] = []
-                group_map[group_id].append(cargo.id)
-        
-        # 创建分组对象
-        for gid, cargo_ids in group_map.items():
-            group = CargoGroup(
-                id=gid,
-                name=f"分组{gid}",
-                cargo_ids=cargo_ids
-            )
-            self.cargo_groups.append(group)
+        """从Excel导入货物：在线程池中解析，完成后回到界面线程更新表格"""
+        if self._excel_import_task is not None:
+            QMessageBox.information(self, "提示", "正在导入Excel，请稍候")
+            return
+        task = ExcelImportTask(filename)
+        task.signals.finished.connect(self._on_excel_import_done)
+        task.signals.failed.connect(self._on_excel_import_failed)
+        self._excel_import_task = task
+        # 解析期间用模态等待框挡住主窗口，避免编辑货物、配载或再次导入后被解析结果覆盖
+        progress = QProgressDialog("正在导入Excel...", None, 0, 0, self)
+        progress.setWindowTitle("导入货物")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+        self._excel_import_progress = progress
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        QThreadPool.globalInstance().start(task)
+    
+    def _end_excel_import(self):
+        """结束后台Excel导入：关闭等待框并恢复光标"""
+        self._excel_import_task = None
+        if self._excel_import_progress is not None:
+            self._excel_import_progress.close()
+            self._excel_import_progress = None
+        QApplication.restoreOverrideCursor()
+    
+    def _on_excel_import_done(self, cargos: list, groups: list):
+        """Excel 解析完成（界面线程）"""
+        self._end_excel_import()
+        self.cargos = cargos
+        self.cargo_groups = groups
+        self.color_index = len(cargos)
         
         self.update_cargo_table()
         group_info = f"，{len(self.cargo_groups)}个分组" if self.cargo_groups else ""
         QMessageBox.information(self, "成功", f"成功从Excel导入 {len(self.cargos)} 种货物{group_info}")
     
+    def _on_excel_import_failed(self, message: str):
+        """Excel 解析失败（界面线程）"""
+        self._end_excel_import()
+        QMessageBox.critical(self, "错误", f"导入失败: {message}")
+    
     def export_cargos(self):
         """导出货物"""
         if not self.cargos:
@@ -3764,65 +4807,92 @@ class ContainerLoadingApp(QMainWindow):
                 if filename.endswith('.xlsx'):
                     self.export_to_excel(filename)
                 else:
-                    data = []
-                    for cargo in self.cargos:
-                        d = asdict(cargo)
-                        d['color'] = list(d['color'])
-                        data.append(d)
-                    with open(filename, "w", encoding="utf-8") as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
+                    self._write_json(filename, [cargo.to_dict() for cargo in self.cargos])
                     QMessageBox.information(self, "成功", "货物导出成功")
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"导出失败: {e}")
     
+    @staticmethod
+    def _write_json(filename: str, data):
+        """写出缩进2格的UTF-8 JSON（文本模式写入，换行符按平台转换，与原 json.dump 一致）
+        装有 orjson 时用它序列化：结构和缩进相同，但浮点数写法可能不同（如 5e-05 写成 0.00005、
+        1e+16 写成 1e16），NaN/Infinity 写成 null；未安装时输出与原 json.dump 相同"""
+        if ORJSON_SUPPORT:
+            text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+        else:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(text)
+    
     def export_to_excel(self, filename):
         """导出货物到Excel"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "货物清单"
-        
-        # 设置标题样式
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
+        # 只写模式按行流式写出，不在内存中保留整张表
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("货物清单")
+        
+        # 标题/数据样式注册为命名样式，每个单元格只引用样式名
         thin_border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
+        header_style = NamedStyle(
+            name="cargo_header",
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="2196F3", end_color="2196F3", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=thin_border
+        )
+        body_style = NamedStyle(name="cargo_body", border=thin_border)
+        wb.add_named_style(header_style)
+        wb.add_named_style(body_style)
+        
+        # 调整列宽（只写模式下需在写入行之前设置）
+        column_widths = [15, 12, 12, 12, 12, 10, 10, 14, 14, 14, 10]
+        for col, width in enumerate(column_widths, 1):
+            ws.column_dimensions[chr(64 + col)].width = width
+        
+        def styled_row(values, style):
+            cells = [WriteOnlyCell(ws, value=value) for value in values]
+            for cell in cells:
+                cell.style = style
+            return cells
         
         # 写入标题行
         headers = ["货物名称", "长度(cm)", "宽度(cm)", "高度(cm)", "重量(kg)", "数量", "可堆叠", "单件体积(m³)", "总体积(m³)", "总重量(kg)", "分组"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = thin_border
+        ws.append(styled_row(headers, "cargo_header"))
         
         # 写入数据
-        for row, cargo in enumerate(self.cargos, 2):
-            ws.cell(row=row, column=1, value=cargo.name).border = thin_border
-            ws.cell(row=row, column=2, value=cargo.length).border = thin_border
-            ws.cell(row=row, column=3, value=cargo.width).border = thin_border
-            ws.cell(row=row, column=4, value=cargo.height).border = thin_border
-            ws.cell(row=row, column=5, value=cargo.weight).border = thin_border
-            ws.cell(row=row, column=6, value=cargo.quantity).border = thin_border
-            ws.cell(row=row, column=7, value="是" if cargo.stackable else "否").border = thin_border
-            ws.cell(row=row, column=8, value=round(cargo.volume / 1000000, 4)).border = thin_border
-            ws.cell(row=row, column=9, value=round(cargo.total_volume / 1000000, 4)).border = thin_border
-            ws.cell(row=row, column=10, value=cargo.total_weight).border = thin_border
-            ws.cell(row=row, column=11, value=cargo.group_id or "").border = thin_border
-        
-        # 调整列宽
-        column_widths = [15, 12, 12, 12, 12, 10, 10, 14, 14, 14, 10]
-        for col, width in enumerate(column_widths, 1):
-            ws.column_dimensions[chr(64 + col)].width = width
+        for cargo in self.cargos:
+            ws.append(styled_row((
+                cargo.name,
+                cargo.length,
+                cargo.width,
+                cargo.height,
+                cargo.weight,
+                cargo.quantity,
+                "是" if cargo.stackable else "否",
+                round(cargo.volume / 1000000, 4),
+                round(cargo.total_volume / 1000000, 4),
+                cargo.total_weight,
+                cargo.group_id or "",
+            ), "cargo_body"))
         
         wb.save(filename)
         QMessageBox.information(self, "成功", "货物已导出到Excel文件")
     
+    def _request_gl_update(self):
+        """请求刷新3D视图：同一轮事件循环内的多次请求只触发一次 update"""
+        if self._gl_update_pending:
+            return
+        self._gl_update_pending = True
+        QTimer.singleShot(0, self._do_gl_update)
+    
+    def _do_gl_update(self):
+        self._gl_update_pending = False
+        self.gl_widget.update()
+    
     def start_loading(self):
         """开始配载"""
         if not self.container:
@@ -3870,22 +4940,14 @@ class ContainerLoadingApp(QMainWindow):
         
         # 收集启用的规则
         active_rules = []
-        for row in range(self.rules_list.rowCount()):
-            checkbox = self.rules_list.cellWidget(row, 0)
-            if checkbox and checkbox.isChecked():
-                rule_name = self.rules_list.item(row, 1).text()
-                priority = int(self.rules_list.item(row, 2).text())
-                
-                if rule_name == "相同尺寸优先":
-                    active_rules.append((priority, RuleSameSizeFirst()))
-                elif rule_name == "重货在下":
-                    active_rules.append((priority, RuleHeavyBottom()))
-                elif rule_name == "相似尺寸堆叠":
-                    active_rules.append((priority, RuleSimilarSizeStack()))
-                elif rule_name == "体积大优先":
-                    active_rules.append((priority, RuleVolumeFirst()))
-                elif rule_name == "优先级排序":
-                    active_rules.append((priority, RulePriorityFirst()))
+        rules_list = self.rules_list
+        checked_rows = [(rules_list.item(row, 1).text(), rules_list.item(row, 2).text())
+                        for row in range(rules_list.rowCount())
+                        if rules_list.cellWidget(row, 0) and rules_list.cellWidget(row, 0).isChecked()]
+        for rule_name, priority in checked_rows:
+            rule_cls = RULE_REGISTRY.get(rule_name)
+            if rule_cls:
+                active_rules.append((int(priority), rule_cls()))
         
         self.loading_progress.setValue(10)
         self.loading_progress.setLabelText("正在排序配载规则...")
@@ -3927,7 +4989,7 @@ class ContainerLoadingApp(QMainWindow):
         self.placed_cargos = loaded
         self.container_results = []  # 清空多集装箱结果
         self.gl_widget.placed_cargos = loaded
-        self.gl_widget.update()
+        self._request_gl_update()
         
         # 隐藏集装箱选择器
         self.container_selector_group.setVisible(False)
@@ -3987,26 +5049,60 @@ class ContainerLoadingApp(QMainWindow):
                 f"载重利用率: {stats['weight_utilization']:.1f}%\n"
                 f"重心状态: {cog_status}")
     
+    def _expand_cargos(self) -> List[Cargo]:
+        """按数量展开为单件货物，返回新列表
+        货物清单未变（update_cargo_table / 单元格编辑会作废缓存）时复用上次展开的单件对象"""
+        key = tuple((id(cargo), cargo.quantity) for cargo in self.cargos)
+        if self._expanded_cargos is None or self._expanded_cargos[0] != key:
+            units = [cargo.unit_copy(f"{cargo.id}_{i}")
+                     for cargo in self.cargos for i in range(cargo.quantity)]
+            self._expanded_cargos = (key, units)
+        return list(self._expanded_cargos[1])
+    
+    def _isometric_png(self, container: Container, placed_cargos: List[PlacedCargo],
+                       width: int, height: int) -> Optional[bytes]:
+        """渲染等轴测视图并编码为PNG字节（需 gl_widget 当前显示的就是该集装箱）
+        按集装箱尺寸、图片尺寸、拖拽高亮和每件货物的位置/尺寸/颜色缓存，
+        布局未变时重复导出或布局相同的集装箱直接复用，不再读回GL画面；拖拽移动后指纹随之改变"""
+        view = self.gl_widget
+        if view.is_overview_mode():
+            key = None  # 概览画面依赖全部集装箱结果，不缓存
+        else:
+            key = (container.length, container.width, container.height, width, height,
+                   view.selected_cargo_index if view.drag_mode else -1,
+                   tuple((p.x, p.y, p.z, p.rotated,
+                          p.cargo.length, p.cargo.width, p.cargo.height, p.cargo.color)
+                         for p in placed_cargos))
+            png = self._iso_png_cache.get(key)
+            if png is not None:
+                return png
+        iso_img = LoadingImageGenerator(container, placed_cargos, view).generate_isometric_view(width, height)
+        if not iso_img:
+            return None
+        buffer = io.BytesIO()
+        iso_img.save(buffer, format='PNG', compress_level=1)  # 只供ReportLab读取，压缩率无意义
+        png = buffer.getvalue()
+        if key is not None:
+            if len(self._iso_png_cache) >= 8:
+                self._iso_png_cache.pop(next(iter(self._iso_png_cache)))
+            self._iso_png_cache[key] = png
+        return png
+    
     def start_multi_container_loading(self, rules: list):
         """多集装箱配载"""
         container_count = self.container_count_spin.value()
         
         self.container_results = []
-        remaining_cargos = []
         
         # 展开所有货物
-        for cargo in self.cargos:
-            for i in range(cargo.quantity):
-                single_cargo = copy.copy(cargo)
-                single_cargo.quantity = 1
-                single_cargo.id = f"{cargo.id}_{i}"
-                remaining_cargos.append(single_cargo)
+        remaining_cargos = self._expand_cargos()
         
         self.loading_progress.setValue(20)
         self.loading_progress.setLabelText("正在展开货物列表...")
         QApplication.processEvents()
         
-        # 依次填充每个集装箱
+        # 依次填充每个集装箱：每个集装箱装的是前一个集装箱装不下的剩余货物，
+        # 结果依赖顺序，不能预先拆分后并行装载（否则与单集装箱依次装载的方案不一致）
         for container_idx in range(container_count):
             if not remaining_cargos:
                 break
@@ -4025,16 +5121,9 @@ class ContainerLoadingApp(QMainWindow):
             algorithm = LoadingAlgorithm(self.container, rules=rules)
             
             # 尝试装载剩余货物
-            loaded_in_this = []
-            still_remaining = []
-            
-            for cargo in remaining_cargos:
-                if algorithm.place_cargo(cargo):
-                    placed = algorithm.placed_cargos[-1]
-                    placed.container_index = container_idx
-                    loaded_in_this.append(placed)
-                else:
-                    still_remaining.append(cargo)
+            loaded_in_this, still_remaining = algorithm.place_cargo_batch(remaining_cargos)
+            for placed in loaded_in_this:
+                placed.container_index = container_idx
             
             # 创建结果对象
             result = ContainerLoadingResult(
@@ -4084,14 +5173,15 @@ class ContainerLoadingApp(QMainWindow):
         for result in self.container_results:
             for placed in result.placed_cargos:
                 step_num += 1
-                all_steps.append({
-                    'step': step_num,
-                    'container': f"#{result.container_index+1}",
-                    'cargo_name': placed.cargo.name,
-                    'dimensions': f"{placed.actual_length}×{placed.actual_width}×{placed.cargo.height}",
-                    'position': f"({placed.x:.0f}, {placed.y:.0f}, {placed.z:.0f})",
-                    'securing': '标准'
-                })
+                # 按步骤表格列顺序：序号、集装箱、货物名称、尺寸、位置坐标、加固
+                all_steps.append((
+                    str(step_num),
+                    f"#{result.container_index+1}",
+                    placed.cargo.name,
+                    f"{placed.actual_length}×{placed.actual_width}×{placed.cargo.height}",
+                    f"({placed.x:.0f}, {placed.y:.0f}, {placed.z:.0f})",
+                    '标准'
+                ))
         self.update_steps_table(all_steps)
         
         # 显示结果
@@ -4114,41 +5204,12 @@ class ContainerLoadingApp(QMainWindow):
     
     def update_steps_table(self, steps: list):
         """更新装载步骤表格"""
-        self.steps_table.setRowCount(len(steps))
-        for i, step in enumerate(steps):
-            # 序号
-            item0 = QTableWidgetItem(str(step.get('step', i+1)))
-            item0.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.steps_table.setItem(i, 0, item0)
-            
-            # 集装箱
-            item1 = QTableWidgetItem(step.get('container', '-'))
-            item1.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.steps_table.setItem(i, 1, item1)
-            
-            # 货物名称
-            self.steps_table.setItem(i, 2, QTableWidgetItem(step.get('cargo_name', '')))
-            
-            # 尺寸
-            item3 = QTableWidgetItem(step.get('dimensions', ''))
-            item3.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.steps_table.setItem(i, 3, item3)
-            
-            # 位置坐标
-            item4 = QTableWidgetItem(step.get('position', ''))
-            item4.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.steps_table.setItem(i, 4, item4)
-            
-            # 加固建议
-            item5 = QTableWidgetItem(step.get('securing', '标准'))
-            item5.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.steps_table.setItem(i, 5, item5)
+        self.steps_model.set_steps(steps)
     
     def create_cargo_group(self):
         """创建货物分组"""
-        selected_rows = set()
-        for item in self.cargo_table.selectedItems():
-            selected_rows.add(item.row())
+        # 整行选择，每个选中行只取一个索引，不必遍历所有选中单元格
+        selected_rows = {index.row() for index in self.cargo_table.selectionModel().selectedRows()}
         
         if len(selected_rows) < 2:
             QMessageBox.warning(self, "警告", "请至少选择2个货物来创建分组")
@@ -4177,27 +5238,34 @@ class ContainerLoadingApp(QMainWindow):
     
     def ungroup_cargo(self):
         """取消货物分组"""
-        selected_rows = set()
-        for item in self.cargo_table.selectedItems():
-            selected_rows.add(item.row())
+        # 整行选择，每个选中行只取一个索引，不必遍历所有选中单元格
+        selected_rows = {index.row() for index in self.cargo_table.selectionModel().selectedRows()}
         
         if not selected_rows:
             QMessageBox.warning(self, "警告", "请选择要取消分组的货物")
             return
         
+        # 货物ID -> 所在分组，只遍历一次分组列表（同一货物在多个分组时取第一个）
+        group_of = {}
+        for group in self.cargo_groups:
+            for cargo_id in group.cargo_ids:
+                group_of.setdefault(cargo_id, group)
+        
         ungrouped_count = 0
+        emptied = set()
         for row in selected_rows:
             cargo = self.cargos[row]
             if cargo.group_id:
                 # 从分组中移除
-                for group in self.cargo_groups:
-                    if cargo.id in group.cargo_ids:
-                        group.cargo_ids.remove(cargo.id)
-                        if not group.cargo_ids:  # 如果分组为空，删除分组
-                            self.cargo_groups.remove(group)
-                        break
+                group = group_of.pop(cargo.id, None)
+                if group is not None:
+                    group.cargo_ids.remove(cargo.id)
+                    if not group.cargo_ids:  # 如果分组为空，删除分组
+                        emptied.add(id(group))
                 cargo.group_id = None
                 ungrouped_count += 1
+        if emptied:
+            self.cargo_groups = [g for g in self.cargo_groups if id(g) not in emptied]
         
         self.update_cargo_table()
         if ungrouped_count > 0:
@@ -4223,9 +5291,11 @@ class ContainerLoadingApp(QMainWindow):
         layout.addWidget(hint_label)
         
         # 货物选择
+        def item_text(i: int, pc: PlacedCargo) -> str:
+            return f"{i+1}. {pc.cargo.name} @ ({pc.x:.0f}, {pc.y:.0f}, {pc.z:.0f})"
+        
         cargo_combo = QComboBox()
-        for i, pc in enumerate(self.placed_cargos):
-            cargo_combo.addItem(f"{i+1}. {pc.cargo.name} @ ({pc.x:.0f}, {pc.y:.0f}, {pc.z:.0f})")
+        cargo_combo.addItems([item_text(i, pc) for i, pc in enumerate(self.placed_cargos)])
         layout.addWidget(cargo_combo)
         
         # 位置编辑
@@ -4274,9 +5344,8 @@ class ContainerLoadingApp(QMainWindow):
                 pc.y = y_spin.value()
                 pc.z = z_spin.value()
                 pc.rotated = rotate_check.isChecked()
-                self.gl_widget.update()
-                cargo_combo.setItemText(index, 
-                    f"{index+1}. {pc.cargo.name} @ ({pc.x:.0f}, {pc.y:.0f}, {pc.z:.0f})")
+                self._request_gl_update()
+                cargo_combo.setItemText(index, item_text(index, pc))
         
         cargo_combo.currentIndexChanged.connect(on_cargo_selected)
         on_cargo_selected(0)  # 初始化第一个
@@ -4293,12 +5362,10 @@ class ContainerLoadingApp(QMainWindow):
             if index >= 0 and index < len(self.placed_cargos):
                 del self.placed_cargos[index]
                 cargo_combo.removeItem(index)
-                self.gl_widget.update()
-                # 更新组合框中的编号
-                for i in range(cargo_combo.count()):
-                    pc = self.placed_cargos[i]
-                    cargo_combo.setItemText(i, 
-                        f"{i+1}. {pc.cargo.name} @ ({pc.x:.0f}, {pc.y:.0f}, {pc.z:.0f})")
+                self._request_gl_update()
+                # 更新组合框中的编号：被删项之前的编号不变，只重写其后的项
+                for i in range(index, cargo_combo.count()):
+                    cargo_combo.setItemText(i, item_text(i, self.placed_cargos[i]))
         
         remove_btn = QPushButton("删除此货物")
         remove_btn.clicked.connect(remove_cargo)
@@ -4310,12 +5377,12 @@ class ContainerLoadingApp(QMainWindow):
         close_btn.clicked.connect(dialog.accept)
         layout.addWidget(close_btn)
         
+        placed_count = len(self.placed_cargos)
         dialog.exec()
         
-        # 更新统计
-        if self.placed_cargos:
-            total_volume = sum(p.cargo.volume for p in self.placed_cargos)
-            total_weight = sum(p.cargo.weight for p in self.placed_cargos)
+        # 更新统计：调整位置不改变体积和重量，只有删除了货物才需要重新汇总
+        if self.placed_cargos and len(self.placed_cargos) != placed_count:
+            total_volume, total_weight = PlacedCargo.totals(self.placed_cargos)
             vol_util = (total_volume / self.container.volume) * 100
             wt_util = (total_weight / self.container.max_weight) * 100
             
@@ -4441,9 +5508,7 @@ class ContainerLoadingApp(QMainWindow):
                 if i in selected_indices and not cargo.is_pallet:
                     # 展开数量
                     for _ in range(cargo.quantity):
-                        single_cargo = copy.copy(cargo)
-                        single_cargo.quantity = 1
-                        selected_cargos.append(single_cargo)
+                        selected_cargos.append(cargo.unit_copy())
 
             if not selected_cargos:
                 QMessageBox.warning(self, "警告", "没有可组托的货物")
@@ -4624,55 +5689,39 @@ class ContainerLoadingApp(QMainWindow):
                     sx += scan_step_x
         
         # 4. 按优先级排序：先底层，再按y坐标（前后），再按x坐标（左右）
-        candidates = list(extreme_points)
-        candidates.sort(key=lambda p: (p[2], p[1], p[0]))
-        
-        for cx, cy, cz in candidates:
-            # 检查边界
-            if cx < -0.01 or cy < -0.01 or cz < -0.01:
-                continue
-            if cx + c_l > pallet_l + 0.01 or cy + c_w > pallet_w + 0.01 or cz + c_h > max_h + 0.01:
-                continue
-            
-            # 检查与已放置物品的碰撞
-            collision = False
-            for item in placed_items:
-                x, y, z, l, w, h = item
-                # 使用严格的碰撞检测
-                if (cx < x + l and cx + c_l > x and
-                    cy < y + w and cy + c_w > y and
-                    cz < z + h and cz + c_h > z):
-                    collision = True
-                    break
-            
-            if collision:
-                continue
-            
-            # 检查底部支撑（如果不在底层）
-            if cz > 0.01:
-                support = self._check_support(cx, cy, cz, c_l, c_w, placed_items)
-                if not support:
-                    continue
+        candidates = sorted(extreme_points, key=lambda p: (p[2], p[1], p[0]))
+        
+        # 5. 所有候选点一次性做边界、碰撞和支撑检查，取排序后第一个可放置的点
+        points = np.array(candidates, dtype=np.float64)
+        cx, cy, cz = points[:, 0], points[:, 1], points[:, 2]
+        # 检查边界
+        ok = ((cx >= -0.01) & (cy >= -0.01) & (cz >= -0.01) &
+              (cx + c_l <= pallet_l + 0.01) & (cy + c_w <= pallet_w + 0.01) & (cz + c_h <= max_h + 0.01))
+        
+        if placed_items:
+            x, y, z, l, w, h = np.array(placed_items, dtype=np.float64).T
+            # 检查与已放置物品的碰撞（严格，不留容差）
+            idx = np.flatnonzero(ok)
+            px, py, pz = cx[idx, None], cy[idx, None], cz[idx, None]
+            ok[idx] = ~((px < x + l) & (px + c_l > x) &
+                        (py < y + w) & (py + c_w > y) &
+                        (pz < z + h) & (pz + c_h > z)).any(axis=1)
             
-            return (cx, cy, cz)
-        
-        return None
-    
-    def _check_support(self, x, y, z, l, w, placed_items) -> bool:
-        """检查底部是否有足够支撑"""
-        support_area = 0
-        required_area = l * w * 0.7  # 需要70%的支撑面积
-        
-        for item in placed_items:
-            ix, iy, iz, il, iw, ih = item
-            # 检查是否在正下方
-            if abs(iz + ih - z) < 0.1:  # 顶部接触
-                # 计算重叠面积
-                overlap_x = max(0, min(x + l, ix + il) - max(x, ix))
-                overlap_y = max(0, min(y + w, iy + iw) - max(y, iy))
-                support_area += overlap_x * overlap_y
+            # 检查底部支撑（如果不在底层）：顶部接触的物品重叠面积至少为底面的70%
+            idx = np.flatnonzero(ok & (cz > 0.01))
+            if len(idx):
+                px, py, pz = cx[idx, None], cy[idx, None], cz[idx, None]
+                overlap_x = np.maximum(0, np.minimum(px + c_l, x + l) - np.maximum(px, x))
+                overlap_y = np.maximum(0, np.minimum(py + c_w, y + w) - np.maximum(py, y))
+                areas = _ordered_row_sums(np.where(np.abs(z + h - pz) < 0.1, overlap_x * overlap_y, 0))
+                required_area = c_l * c_w * 0.7
+                ok[idx] = [area >= required_area for area in areas]
+        else:
+            # 没有已放置物品时悬空的点没有支撑
+            ok &= cz <= 0.01
         
-        return support_area >= required_area
+        hits = np.flatnonzero(ok)
+        return candidates[hits[0]] if len(hits) else None
     
     def _show_palletize_result(self, palletized_cargos: List[Cargo], remaining_cargos: List[Cargo]):
         """显示组托结果对话框"""
@@ -4964,7 +6013,7 @@ class ContainerLoadingApp(QMainWindow):
     def load_pallets_to_container(self):
         """装载托盘到集装箱"""
         # 筛选托盘货物
-        pallet_cargos = [c for c in self.cargos if c.name.startswith("托盘")]
+        pallet_cargos = [c for c in self.cargos if c.is_pallet]
         
         if not pallet_cargos:
             QMessageBox.warning(self, "警告", "没有托盘可装载，请先执行'小件组托'")
@@ -4984,7 +6033,7 @@ class ContainerLoadingApp(QMainWindow):
         """清除配载结果"""
         self.placed_cargos.clear()
         self.gl_widget.placed_cargos = []
-        self.gl_widget.update()
+        self._request_gl_update()
         
         self.stats_label.setText("请先添加货物并开始配载")
         self.volume_progress.setValue(0)
@@ -5018,15 +6067,15 @@ class ContainerLoadingApp(QMainWindow):
     
     def export_single_container_plan(self, filename: str):
         """导出单集装箱配载方案"""
-        # 计算重心信息
-        total_volume = sum(p.cargo.volume for p in self.placed_cargos)
+        # 计算重心信息：一次构建数组镜像，体积和重心在 numpy 中汇总
+        arrays = PlacedCargoArrays.from_placed(self.placed_cargos)
+        total_volume = float(arrays.sizes.prod(axis=1).sum())
+        # 总重量保持原始数值类型（整数重量在JSON中仍输出为整数）
         total_weight = sum(p.cargo.weight for p in self.placed_cargos)
         
         # 计算重心
         if total_weight > 0:
-            cog_x = sum(p.center_x * p.cargo.weight for p in self.placed_cargos) / total_weight
-            cog_y = sum(p.center_y * p.cargo.weight for p in self.placed_cargos) / total_weight
-            cog_z = sum(p.center_z * p.cargo.weight for p in self.placed_cargos) / total_weight
+            cog_x, cog_y, cog_z = arrays.center_of_gravity()
             center_x = self.container.length / 2
             center_y = self.container.width / 2
             offset_x = cog_x - center_x
@@ -5074,10 +6123,12 @@ class ContainerLoadingApp(QMainWindow):
                 f.write(f"载重利用率: {result.weight_utilization:.1f}%\n\n")
                 
                 f.write("装载明细:\n")
-                for i, p in enumerate(result.placed_cargos, 1):
-                    f.write(f"  {i:3d}. {p.cargo.name}\n")
-                    f.write(f"       尺寸: {p.actual_length}×{p.actual_width}×{p.cargo.height} cm\n")
-                    f.write(f"       位置: ({p.x:.0f}, {p.y:.0f}, {p.z:.0f})\n")
+                # 每件货物拼成一段文本，整个集装箱的明细一次写入
+                f.write("".join(
+                    f"  {i:3d}. {p.cargo.name}\n"
+                    f"       尺寸: {p.actual_length}×{p.actual_width}×{p.cargo.height} cm\n"
+                    f"       位置: ({p.x:.0f}, {p.y:.0f}, {p.z:.0f})\n"
+                    for i, p in enumerate(result.placed_cargos, 1)))
                 f.write("\n")
             
             f.write("=" * 70 + "\n")
@@ -5117,8 +6168,7 @@ class ContainerLoadingApp(QMainWindow):
             }
             data["containers"].append(container_data)
         
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(filename, data)
     
     def export_multi_container_pdf(self, filename: str):
         """导出多集装箱方案为PDF文件"""
@@ -5126,25 +6176,16 @@ class ContainerLoadingApp(QMainWindow):
             QMessageBox.warning(self, "警告", "PDF导出功能不可用，请安装 reportlab 库")
             return
         
-        from reportlab.lib import colors
         from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import cm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.enums import TA_CENTER
+        from reportlab.platypus import SimpleDocTemplate, Table, LongTable, Paragraph, Spacer, PageBreak
         
         doc = SimpleDocTemplate(filename, pagesize=A4,
                                rightMargin=2*cm, leftMargin=2*cm,
                                topMargin=2*cm, bottomMargin=2*cm)
         
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle('ChineseTitle', parent=styles['Title'],
-                                     fontName='ChineseFont', fontSize=24, alignment=TA_CENTER, spaceAfter=30)
-        heading_style = ParagraphStyle('ChineseHeading', parent=styles['Heading2'],
-                                       fontName='ChineseFont', fontSize=14,
-                                       textColor=colors.HexColor('#2c5282'), spaceBefore=15, spaceAfter=10)
-        normal_style = ParagraphStyle('ChineseNormal', parent=styles['Normal'],
-                                      fontName='ChineseFont', fontSize=10, leading=14)
+        title_style, heading_style, normal_style = _pdf_paragraph_styles()
+        table_styles = _pdf_table_styles()
         
         elements = []
         elements.append(Paragraph("多集装箱配载方案", title_style))
@@ -5158,14 +6199,7 @@ class ContainerLoadingApp(QMainWindow):
             ['总装载件数', f'{len(self.placed_cargos)} 件'],
         ]
         summary_table = Table(summary_data, colWidths=[6*cm, 9*cm])
-        summary_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        summary_table.setStyle(table_styles['summary'])
         elements.append(summary_table)
         elements.append(Spacer(1, 20))
         
@@ -5182,14 +6216,7 @@ class ContainerLoadingApp(QMainWindow):
                 ['载重利用率', f'{result.weight_utilization:.1f}%'],
             ]
             info_table = Table(info_data, colWidths=[5*cm, 10*cm])
-            info_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#38a169')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                ('PADDING', (0, 0), (-1, -1), 6),
-            ]))
+            info_table.setStyle(table_styles['container_info'])
             elements.append(info_table)
             elements.append(Spacer(1, 10))
             
@@ -5204,17 +6231,9 @@ class ContainerLoadingApp(QMainWindow):
                     f'({p.x:.0f}, {p.y:.0f}, {p.z:.0f})'
                 ])
             
-            cargo_table = Table(cargo_data, colWidths=[1.5*cm, 5*cm, 4*cm, 4.5*cm])
-            cargo_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#805ad5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
-                ('PADDING', (0, 0), (-1, -1), 5),
-            ]))
+            # 明细可能跨多页：LongTable 分页时不重复计算已排版的行，表头在每页重复
+            cargo_table = LongTable(cargo_data, colWidths=[1.5*cm, 5*cm, 4*cm, 4.5*cm], repeatRows=1)
+            cargo_table.setStyle(table_styles['container_cargo'])
             elements.append(cargo_table)
             elements.append(Spacer(1, 15))
             
@@ -5232,28 +6251,19 @@ class ContainerLoadingApp(QMainWindow):
                     self.gl_widget.placed_cargos = result.placed_cargos
                     self.gl_widget.current_container_index = idx  # 非-1表示单个集装箱模式
                     
-                    generator = LoadingImageGenerator(result.container, result.placed_cargos, self.gl_widget)
-                    iso_img = generator.generate_isometric_view(450, 350)
-                    
-                    # 恢复原来的数据
-                    self.gl_widget.container = old_container
-                    self.gl_widget.placed_cargos = old_placed
-                    self.gl_widget.current_container_index = old_index
+                    try:
+                        iso_png = self._isometric_png(result.container, result.placed_cargos, 450, 350)
+                    finally:
+                        # 恢复原来的数据
+                        self.gl_widget.container = old_container
+                        self.gl_widget.placed_cargos = old_placed
+                        self.gl_widget.current_container_index = old_index
                     
-                    if iso_img:
-                        import tempfile
-                        tmp_dir = os.path.dirname(filename) or tempfile.gettempdir()
-                        tmp_path = os.path.join(tmp_dir, f"_temp_container_{idx}_{id(self)}.png")
-                        iso_img.save(tmp_path)
-                        
+                    if iso_png:
+                        # PNG字节直接交给ReportLab，不经临时文件
                         elements.append(Paragraph(f"装载示意图", normal_style))
                         elements.append(Spacer(1, 5))
-                        elements.append(RLImage(tmp_path, width=14*cm, height=11*cm))
-                        
-                        # 记录临时文件以便后续清理
-                        if not hasattr(self, '_temp_files'):
-                            self._temp_files = []
-                        self._temp_files.append(tmp_path)
+                        elements.append(RLImage(io.BytesIO(iso_png), width=14*cm, height=11*cm))
                 except Exception as e:
                     elements.append(Paragraph(f"装载图生成失败: {str(e)}", normal_style))
             
@@ -5264,16 +6274,6 @@ class ContainerLoadingApp(QMainWindow):
                 elements.append(PageBreak())
         
         doc.build(elements)
-        
-        # 清理临时文件
-        if hasattr(self, '_temp_files'):
-            for tmp_path in self._temp_files:
-                try:
-                    if os.path.exists(tmp_path):
-                        os.remove(tmp_path)
-                except:
-                    pass
-            self._temp_files = []
     
     def export_single_container_json(self, filename: str, total_volume: float, total_weight: float,
                                       cog_x: float, cog_y: float, cog_z: float,
@@ -5314,8 +6314,7 @@ class ContainerLoadingApp(QMainWindow):
                 for i, p in enumerate(self.placed_cargos)
             ]
         }
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(filename, data)
     
     def export_single_container_txt(self, filename: str, total_volume: float, total_weight: float,
                                      cog_x: float, cog_y: float, cog_z: float,
@@ -5349,13 +6348,16 @@ class ContainerLoadingApp(QMainWindow):
             f.write("装载步骤 (按顺序装载):\n")
             f.write("-" * 70 + "\n\n")
             
-            for i, p in enumerate(self.placed_cargos, 1):
-                f.write(f"步骤 {i:3d}: {p.cargo.name}\n")
-                f.write(f"  尺寸: {p.cargo.length} × {p.cargo.width} × {p.cargo.height} cm\n")
-                f.write(f"  重量: {p.cargo.weight} kg\n")
-                f.write(f"  位置: X={p.x:.1f}, Y={p.y:.1f}, Z={p.z:.1f} cm\n")
-                f.write(f"  旋转: {'是' if p.rotated else '否'}\n")
-                f.write(f"  加固: {self.get_securing_advice(p, i-1, len(self.placed_cargos))}\n\n")
+            # 每个步骤拼成一段文本，全部步骤一次写入
+            total_placed = len(self.placed_cargos)
+            f.write("".join(
+                f"步骤 {i:3d}: {p.cargo.name}\n"
+                f"  尺寸: {p.cargo.length} × {p.cargo.width} × {p.cargo.height} cm\n"
+                f"  重量: {p.cargo.weight} kg\n"
+                f"  位置: X={p.x:.1f}, Y={p.y:.1f}, Z={p.z:.1f} cm\n"
+                f"  旋转: {'是' if p.rotated else '否'}\n"
+                f"  加固: {self.get_securing_advice(p, i-1, total_placed)}\n\n"
+                for i, p in enumerate(self.placed_cargos, 1)))
             
             f.write("-" * 70 + "\n")
             f.write("尾部加固建议:\n")
@@ -5380,12 +6382,9 @@ class ContainerLoadingApp(QMainWindow):
             QMessageBox.warning(self, "警告", "PDF导出功能不可用，请安装 reportlab 库:\npip install reportlab")
             return
         
-        from reportlab.lib import colors
         from reportlab.lib.pagesizes import A4, landscape
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import cm, mm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image as RLImage, PageBreak
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        from reportlab.platypus import SimpleDocTemplate, Table, LongTable, Paragraph, Spacer, Image as RLImage, PageBreak
         
         # 创建PDF文档
         doc = SimpleDocTemplate(
@@ -5397,36 +6396,9 @@ class ContainerLoadingApp(QMainWindow):
             bottomMargin=2*cm
         )
         
-        # 样式设置
-        styles = getSampleStyleSheet()
-        
-        # 中文标题样式
-        title_style = ParagraphStyle(
-            'ChineseTitle',
-            parent=styles['Title'],
-            fontName='ChineseFont',
-            fontSize=24,
-            alignment=TA_CENTER,
-            spaceAfter=30
-        )
-        
-        heading_style = ParagraphStyle(
-            'ChineseHeading',
-            parent=styles['Heading2'],
-            fontName='ChineseFont',
-            fontSize=14,
-            textColor=colors.HexColor('#2c5282'),
-            spaceBefore=15,
-            spaceAfter=10
-        )
-        
-        normal_style = ParagraphStyle(
-            'ChineseNormal',
-            parent=styles['Normal'],
-            fontName='ChineseFont',
-            fontSize=10,
-            leading=14
-        )
+        # 样式设置（中文标题/小节/正文样式各次导出共用）
+        title_style, heading_style, normal_style = _pdf_paragraph_styles()
+        table_styles = _pdf_table_styles()
         
         elements = []
         
@@ -5446,16 +6418,7 @@ class ContainerLoadingApp(QMainWindow):
         ]
         
         container_table = Table(container_data, colWidths=[5*cm, 10*cm])
-        container_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a5568')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f7fafc')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        container_table.setStyle(table_styles['container'])
         elements.append(container_table)
         elements.append(Spacer(1, 20))
         
@@ -5474,16 +6437,7 @@ class ContainerLoadingApp(QMainWindow):
         ]
         
         stats_table = Table(stats_data, colWidths=[5*cm, 10*cm])
-        stats_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#38a169')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#f0fff4')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        stats_table.setStyle(table_styles['stats'])
         elements.append(stats_table)
         elements.append(Spacer(1, 20))
         
@@ -5503,16 +6457,7 @@ class ContainerLoadingApp(QMainWindow):
         ]
         
         cog_table = Table(cog_data, colWidths=[4*cm, 5*cm, 6*cm])
-        cog_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3182ce')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#ebf8ff')),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        cog_table.setStyle(table_styles['cog'])
         elements.append(cog_table)
         elements.append(Spacer(1, 20))
         
@@ -5521,31 +6466,25 @@ class ContainerLoadingApp(QMainWindow):
         
         # 装载步骤表头
         loading_header = ['序号', '货物名称', '尺寸 (cm)', '重量 (kg)', '位置 (X,Y,Z)', '旋转', '加固建议']
+        total_placed = len(self.placed_cargos)
         loading_data = [loading_header]
         
         for i, p in enumerate(self.placed_cargos, 1):
-            row = [
+            cargo = p.cargo
+            loading_data.append([
                 str(i),
-                p.cargo.name[:10],  # 截断过长的名称
-                f'{p.cargo.length}×{p.cargo.width}×{p.cargo.height}',
-                f'{p.cargo.weight:.1f}',
+                cargo.name[:10],  # 截断过长的名称
+                f'{cargo.length}×{cargo.width}×{cargo.height}',
+                f'{cargo.weight:.1f}',
                 f'{p.x:.0f},{p.y:.0f},{p.z:.0f}',
                 '是' if p.rotated else '否',
-                self.get_securing_advice(p, i-1, len(self.placed_cargos))[:15]
-            ]
-            loading_data.append(row)
+                self.get_securing_advice(p, i-1, total_placed)[:15]
+            ])
         
-        loading_table = Table(loading_data, colWidths=[1*cm, 2.5*cm, 3*cm, 2*cm, 2.5*cm, 1.2*cm, 3*cm])
-        loading_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#805ad5')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
-            ('PADDING', (0, 0), (-1, -1), 5),
-        ]))
+        # 明细行数随货物数增长，会跨多页：LongTable 分页时不重复计算已排版的行，表头在每页重复
+        loading_table = LongTable(loading_data, colWidths=[1*cm, 2.5*cm, 3*cm, 2*cm, 2.5*cm, 1.2*cm, 3*cm],
+                                  repeatRows=1)
+        loading_table.setStyle(table_styles['loading'])
         elements.append(loading_table)
         elements.append(Spacer(1, 20))
         
@@ -5589,16 +6528,7 @@ class ContainerLoadingApp(QMainWindow):
                     ])
                 
                 pallet_table = Table(pallet_data, colWidths=[1*cm, 3.5*cm, 3.5*cm, 3.5*cm, 2.5*cm])
-                pallet_table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (-1, -1), 'ChineseFont'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ed8936')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#fed7aa')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fffaf0')]),
-                    ('PADDING', (0, 0), (-1, -1), 4),
-                ]))
+                pallet_table.setStyle(table_styles['pallet'])
                 elements.append(pallet_table)
                 elements.append(Spacer(1, 15))
             
@@ -5632,85 +6562,46 @@ class ContainerLoadingApp(QMainWindow):
                         pallet_img = pallet_generator._generate_isometric_view_pil(400, 300)
                         
                         if pallet_img:
-                            import tempfile
-                            tmp_dir = os.path.dirname(filename) or tempfile.gettempdir()
-                            pallet_tmp_path = os.path.join(tmp_dir, f"_temp_pallet_{pallet.name}_{id(self)}.png")
-                            pallet_img.save(pallet_tmp_path)
+                            # 在内存中编码，ReportLab 直接读取，不经临时文件
+                            pallet_buffer = io.BytesIO()
+                            pallet_img.save(pallet_buffer, format='PNG', compress_level=1)
+                            pallet_buffer.seek(0)
                             
                             elements.append(Paragraph(f"{pallet.name} 组托示意图:", normal_style))
-                            elements.append(RLImage(pallet_tmp_path, width=12*cm, height=9*cm))
+                            elements.append(RLImage(pallet_buffer, width=12*cm, height=9*cm))
                             elements.append(Spacer(1, 10))
-                            
-                            # 记录临时文件用于清理
-                            if not hasattr(self, '_temp_pallet_files'):
-                                self._temp_pallet_files = []
-                            self._temp_pallet_files.append(pallet_tmp_path)
                     except Exception as e:
                         elements.append(Paragraph(f"托盘视图生成失败: {str(e)}", normal_style))
         
         # 尝试添加装载图
         section_num = "七" if pallet_cargos else "六"
-        tmp_path = None
         if PIL_SUPPORT:
             elements.append(PageBreak())
             elements.append(Paragraph(f"{section_num}、装载示意图", heading_style))
             
             try:
                 # 生成等轴测视图
-                generator = LoadingImageGenerator(self.container, self.placed_cargos, self.gl_widget)
-                iso_img = generator.generate_isometric_view(500, 400)
+                iso_png = self._isometric_png(self.container, self.placed_cargos, 500, 400)
                 
-                if iso_img:
-                    # 保存临时图片到与目标PDF相同的目录
-                    import tempfile
-                    tmp_dir = os.path.dirname(filename) or tempfile.gettempdir()
-                    tmp_path = os.path.join(tmp_dir, f"_temp_loading_diagram_{id(self)}.png")
-                    iso_img.save(tmp_path)
-                    
-                    # 添加到PDF
-                    elements.append(RLImage(tmp_path, width=15*cm, height=12*cm))
+                if iso_png:
+                    # 添加到PDF（PNG字节直接交给ReportLab，不经临时文件）
+                    elements.append(RLImage(io.BytesIO(iso_png), width=15*cm, height=12*cm))
             except Exception as e:
                 elements.append(Paragraph(f"装载图生成失败: {str(e)}", normal_style))
         
         # 生成PDF
         doc.build(elements)
-        
-        # 清理临时文件
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except:
-                pass
-        
-        # 清理组托临时文件
-        if hasattr(self, '_temp_pallet_files'):
-            for pallet_path in self._temp_pallet_files:
-                if os.path.exists(pallet_path):
-                    try:
-                        os.remove(pallet_path)
-                    except:
-                        pass
-            self._temp_pallet_files = []
 
     def get_securing_advice(self, placed_cargo, index: int, total: int) -> str:
-        """获取单个货物的加固建议"""
-        advice = []
-        
-        # 根据位置给出建议
-        if placed_cargo.z == 0:  # 底层
-            advice.append("底层固定")
-        
-        if placed_cargo.cargo.weight > 500:  # 重货
-            advice.append("使用绑带固定")
-        
-        if index >= total - 3:  # 最后几件
-            advice.append("尾部加固")
-        
-        # 根据是否可堆叠
-        if not placed_cargo.cargo.stackable:
-            advice.append("顶部勿压")
-        
-        return ", ".join(advice) if advice else "标准加固"
+        """获取单个货物的加固建议（导出时每件货物调用一次）"""
+        cargo = placed_cargo.cargo
+        advice = ", ".join(filter(None, (
+            "底层固定" if placed_cargo.z == 0 else "",  # 底层
+            "使用绑带固定" if cargo.weight > 500 else "",  # 重货
+            "尾部加固" if index >= total - 3 else "",  # 最后几件
+            "顶部勿压" if not cargo.stackable else "",  # 不可堆叠
+        )))
+        return advice or "标准加固"
     
     def analyze_tail_space(self) -> dict:
         """分析集装箱尾部空间情况，用于生成加固建议"""
@@ -5989,14 +6880,21 @@ class ContainerLoadingApp(QMainWindow):
     def update_stats_for_container(self, container_index: int):
         """更新特定集装箱的统计信息"""
         if container_index < 0:
-            # 显示总体统计
-            total_loaded = sum(len(r.placed_cargos) for r in self.container_results)
-            total_volume = sum(r.total_volume for r in self.container_results)
-            total_weight = sum(r.total_weight for r in self.container_results)
+            # 显示总体统计（每个集装箱只遍历一次货物，累加顺序与逐项 sum 相同）
+            total_loaded = total_volume = total_weight = 0
+            vol_util_sum = wt_util_sum = 0
+            for r in self.container_results:
+                volume, weight, vol_util, wt_util = r.summary()
+                total_loaded += len(r.placed_cargos)
+                total_volume += volume
+                total_weight += weight
+                vol_util_sum += vol_util
+                wt_util_sum += wt_util
             
             # 计算平均利用率
-            avg_vol_util = sum(r.volume_utilization for r in self.container_results) / len(self.container_results) if self.container_results else 0
-            avg_wt_util = sum(r.weight_utilization for r in self.container_results) / len(self.container_results) if self.container_results else 0
+            count = len(self.container_results)
+            avg_vol_util = vol_util_sum / count if count else 0
+            avg_wt_util = wt_util_sum / count if count else 0
             
             self.stats_label.setText(
                 f"共 {len(self.container_results)} 个集装箱 | "
@@ -6011,16 +6909,17 @@ class ContainerLoadingApp(QMainWindow):
         else:
             # 显示单个集装箱统计
             result = self.container_results[container_index]
+            volume, weight, vol_util, wt_util = result.summary()
             self.stats_label.setText(
                 f"集装箱 #{container_index + 1} | "
                 f"装载: {len(result.placed_cargos)} 件 | "
-                f"体积: {result.total_volume/1000000:.2f} m³ | "
-                f"重量: {result.total_weight:.1f} kg"
+                f"体积: {volume/1000000:.2f} m³ | "
+                f"重量: {weight:.1f} kg"
             )
-            self.volume_progress.setValue(int(result.volume_utilization))
-            self.volume_label.setText(f"{result.volume_utilization:.1f}%")
-            self.weight_progress.setValue(int(result.weight_utilization))
-            self.weight_label.setText(f"{result.weight_utilization:.1f}%")
+            self.volume_progress.setValue(int(vol_util))
+            self.volume_label.setText(f"{vol_util:.1f}%")
+            self.weight_progress.setValue(int(wt_util))
+            self.weight_label.setText(f"{wt_util:.1f}%")
     
     # ==================== 拖拽调整功能 ====================
     
@@ -6032,28 +6931,11 @@ class ContainerLoadingApp(QMainWindow):
         self.rotate_cargo_btn.setEnabled(checked)
         
         if checked:
-            self.drag_mode_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #FF9800;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-weight: bold;
-                }
-            """)
+            self.drag_mode_btn.setStyleSheet(self._DRAG_MODE_ON_QSS)
             self.drag_hint_label.setText("拖拽模式已开启：左键选中 → 拖动移动 → Shift+拖动调高度 → R键旋转 → 方向键微调")
             self.drag_hint_label.setVisible(True)
         else:
-            self.drag_mode_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #37474F;
-                    color: white;
-                    border: 1px solid #546E7A;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                }
-            """)
+            self.drag_mode_btn.setStyleSheet(self._DRAG_MODE_OFF_QSS)
             self.drag_hint_label.setVisible(False)
     
     def rotate_selected_cargo_from_btn(self):
@@ -6068,6 +6950,10 @@ class ContainerLoadingApp(QMainWindow):
         else:
             self.drag_hint_label.setText("无法旋转：货物不允许旋转或会与其他货物碰撞")
     
+    def on_view_button_clicked(self, button):
+        """视角按钮点击：切换到按钮上记录的预设视角"""
+        self.gl_widget.set_view(button.property("preset"))
+    
     def toggle_collision_detection(self, state):
         """切换碰撞检测开关"""
         self.gl_widget.collision_enabled = (state == 2)
@@ -6124,13 +7010,7 @@ class ContainerLoadingApp(QMainWindow):
         self.cargo_pos_label.setText(f"位置: X={placed.x:.0f}, Y={placed.y:.0f}, Z={placed.z:.0f} cm")
         self.cargo_rotation_label.setText(f"旋转: {'是 (长宽互换)' if placed.rotated else '否'}")
         
-        # 计算层次 (根据 Z 坐标)
-        layer = 1
-        for i, p in enumerate(self.placed_cargos):
-            if p.z < placed.z:
-                layer = max(layer, 2)
-            if p.z > placed.z:
-                layer = max(layer, 1)
+        # 计算层次 (根据 Z 坐标相对集装箱高度)
         z_height = placed.z
         if z_height == 0:
             layer_text = "底层 (地面)"
@@ -6173,23 +7053,7 @@ class ContainerLoadingApp(QMainWindow):
             self.drag_hint_label.setText(
                 f"已移动: {cargo.cargo.name} | 新位置: ({cargo.x:.0f}, {cargo.y:.0f}, {cargo.z:.0f})"
             )
-            # 更新统计信息
-            self.update_loading_stats()
-    
-    def update_loading_stats(self):
-        """更新装载统计信息"""
-        if not self.placed_cargos:
-            return
-        
-        total_volume = sum(p.cargo.volume for p in self.placed_cargos)
-        total_weight = sum(p.cargo.weight for p in self.placed_cargos)
-        vol_util = (total_volume / self.container.volume) * 100 if self.container.volume > 0 else 0
-        wt_util = (total_weight / self.container.max_weight) * 100 if self.container.max_weight > 0 else 0
-        
-        self.volume_progress.setValue(int(vol_util))
-        self.volume_label.setText(f"{vol_util:.1f}%")
-        self.weight_progress.setValue(int(wt_util))
-        self.weight_label.setText(f"{wt_util:.1f}%")
+            # 移动/旋转不改变总体积和总重量，统计信息无需刷新
     
     # ==================== 导出装载图片 ====================
     